@@ -0,0 +1,65 @@
+"""Benchmark: bytes per block and encode/decode time of the block encodings.
+
+Compares indented JSON (block_data.json), compact JSON (chain log default) and the binary
+encoding with and without compression.
+
+Run from the repository root:
+    python -m benchmarks.bench_block_codec [num_sellers] [repeats]
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from saki_market_game.block_codec import decode_block, encode_block, zstandard
+
+
+def random_block(num_sellers, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "index": 1,
+        "timestamp": 1.7e9,
+        "transactions": {
+            "final_prices": rng.uniform(5, 15, num_sellers).tolist(),
+            "buyer_shares": rng.uniform(0, 5, num_sellers).tolist(),
+            "iterations": 42,
+            "rewards": rng.uniform(0, 0.1, num_sellers).tolist(),
+            "total_payment_with_reward": 1234.5,
+        },
+        "previous_hash": "0" * 64,
+        "block_hash": "f" * 64,
+    }
+
+
+def time_codec(name, encode, decode, record, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        payload = encode(record)
+    encode_seconds = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decoded = decode(payload)
+    decode_seconds = (time.perf_counter() - start) / repeats
+    assert decoded == record, f"{name} did not round-trip the block"
+    print(f"{name:>18}: {len(payload):>9} bytes/block, encode {encode_seconds * 1e3:8.3f} ms, "
+          f"decode {decode_seconds * 1e3:8.3f} ms")
+
+
+def main():
+    num_sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    record = random_block(num_sellers)
+    print(f"Block with {num_sellers} sellers, {repeats} repeats")
+
+    time_codec("json (indent=4)", lambda r: json.dumps(r, indent=4).encode(),
+               lambda p: json.loads(p.decode()), record, repeats)
+    time_codec("json (compact)", encode_block, decode_block, record, repeats)
+    time_codec("binary", lambda r: encode_block(r, "binary"), decode_block, record, repeats)
+    time_codec("binary + zlib", lambda r: encode_block(r, "binary", "zlib"), decode_block, record, repeats)
+    if zstandard is not None:
+        time_codec("binary + zstd", lambda r: encode_block(r, "binary", "zstd"), decode_block, record, repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: startup time of load_blockchain() on a large chain log, and random block access.
+
+The first load also builds the chain query index (one-time).
+
+Run from the repository root:
+    python -m benchmarks.bench_chain_load [num_blocks]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import EnergyBlock, block_to_dict, load_blockchain
+from saki_market_game.chain_store import BlockLog
+
+NUM_BLOCKS = 100_000
+SELLERS_PER_BLOCK = 10
+
+
+def build_chain_log(BASE_DIR, num_blocks, sellers_per_block=SELLERS_PER_BLOCK, seed=0):
+    """Writes a consistent chain of random market blocks straight into a chain log (no block folders)."""
+    rng = np.random.default_rng(seed)
+    store = BlockLog(BASE_DIR, sync_every=10_000)
+    previous_hash = "0"
+    for index in range(num_blocks):
+        if index == 0:
+            transactions = {"message": "Genesis Block"}
+        else:
+            transactions = {
+                "final_prices": rng.uniform(5, 15, sellers_per_block).round(6).tolist(),
+                "buyer_shares": rng.uniform(0, 5, sellers_per_block).round(6).tolist(),
+                "iterations": int(rng.integers(5, 80)),
+                "rewards": rng.uniform(0, 0.1, sellers_per_block).round(6).tolist(),
+                "total_payment_with_reward": float(rng.uniform(100, 500)),
+            }
+        block = EnergyBlock.from_dict({"index": index, "timestamp": 1.7e9 + 900 * index,
+                                       "transactions": transactions, "previous_hash": previous_hash,
+                                       "block_hash": None}, BASE_DIR)
+        block.block_hash = block.calculate_hash()
+        store.append(block_to_dict(block))
+        previous_hash = block.block_hash
+    store.close()
+
+
+def main():
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_BLOCKS
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        start = time.perf_counter()
+        build_chain_log(BASE_DIR, num_blocks)
+        print(f"Built {num_blocks} blocks in {time.perf_counter() - start:.2f}s")
+
+        for verify in (False, True):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                energy_chain = load_blockchain(BASE_DIR, verify=verify)
+            print(f"load_blockchain(verify={verify}): {time.perf_counter() - start:.3f}s "
+                  f"({len(energy_chain.chain)} blocks in memory, {len(energy_chain.store)} on disk)")
+
+        # Random access to old blocks: paged in from the log through the LRU block cache
+        rng = np.random.default_rng(1)
+        positions = rng.integers(0, num_blocks, 200)  # Fits in the default 256-block cache
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            for position in positions:
+                energy_chain.get_block(int(position))
+            print(f"get_block x{len(positions)} ({label} cache): {time.perf_counter() - start:.3f}s "
+                  f"({len(energy_chain.block_cache)} blocks cached)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark: per-seller history queries through the chain index vs scanning the chain log.
+
+Run from the repository root:
+    python -m benchmarks.bench_chain_query [num_blocks]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_chain_load import build_chain_log
+from saki_market_game.chain_index import ChainIndex
+from saki_market_game.chain_store import BlockLog
+
+
+def main():
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    seller = 7
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_chain_log(BASE_DIR, num_blocks)
+        store = BlockLog(BASE_DIR, read_only=True)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            index = ChainIndex(BASE_DIR)
+            index.catch_up(store)
+        print(f"index build ({num_blocks} blocks): {time.perf_counter() - start:.2f}s (one-time)")
+
+        # "What did seller 7 earn in the last 30 days?"
+        end_time = store.read(len(store) - 1)["timestamp"]
+        start_time = end_time - 30 * 24 * 3600
+
+        start = time.perf_counter()
+        total = 0.0
+        for record in store.iter_records():
+            transactions = record["transactions"]
+            if start_time <= record["timestamp"] <= end_time and len(transactions.get("rewards", [])) >= seller:
+                total += transactions["rewards"][seller - 1]
+        print(f"log scan:    {(time.perf_counter() - start) * 1e3:9.2f} ms  reward={total:.6f}")
+
+        start = time.perf_counter()
+        totals = index.seller_totals(seller, start_time, end_time)
+        print(f"index query: {(time.perf_counter() - start) * 1e3:9.2f} ms  reward={totals['total_reward']:.6f}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
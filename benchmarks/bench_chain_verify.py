@@ -0,0 +1,34 @@
+"""Benchmark: chain verification throughput (blocks/s), serial vs. process pool vs. incremental.
+
+Run from the repository root:
+    python -m benchmarks.bench_chain_verify [num_blocks]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+
+from benchmarks.bench_chain_load import build_chain_log
+from saki_market_game.chain_verifier import verify_chain
+
+NUM_BLOCKS = 50_000
+
+
+def run(label, BASE_DIR, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = verify_chain(BASE_DIR, **kwargs)
+    print(f"{label:<22} {report['verified']:>8} blocks {report['seconds']:>8.2f}s "
+          f"{report['blocks_per_second']:>10.0f} blocks/s  ok={report['ok']}")
+
+
+def main():
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_BLOCKS
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        build_chain_log(BASE_DIR, num_blocks)
+        run("serial (full)", BASE_DIR, processes=1, full=True)
+        run("process pool (full)", BASE_DIR, full=True)
+        run("incremental (no new)", BASE_DIR)
+
+
+if __name__ == "__main__":
+    main()
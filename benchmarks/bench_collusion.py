@@ -0,0 +1,55 @@
+"""Benchmark: online collusion detection inside saki(), and a vectorized scan of chain history.
+
+Run from the repository root:
+    python -m benchmarks.bench_collusion [num_blocks]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_chain_load import build_chain_log
+from saki_market_game.blockchain_engine import load_blockchain
+from saki_market_game.collusion import CollusionMonitor, detect_collusion, scan_chain_collusion
+from saki_market_game.saki_core import saki
+
+
+def lockstep_market(num_sellers=5):
+    """Identical sellers creeping up in small, equal steps (never converging within tolerance)."""
+    return dict(num_sellers=num_sellers, capacities=[50.0] * num_sellers, qualities=[0.8] * num_sellers,
+                production_costs=[10.0] * num_sellers, buyer_demand=100, max_profit_percentage=0.3,
+                min_profits=[1.0] * num_sellers, max_change_percentage=0.0005, tolerance=0.001,
+                initial_prices=[11.0] * num_sellers, engine="vectorized")
+
+
+def main():
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    market = lockstep_market()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        final_prices, buyer_shares, price_history, _, iterations = saki(**market)
+        verdict = detect_collusion(market["num_sellers"], final_prices, buyer_shares, price_history, iterations)
+        offline_seconds = time.perf_counter() - start
+
+        monitor = CollusionMonitor(market["num_sellers"])
+        start = time.perf_counter()
+        _, buyer_shares, _, _, online_iterations = saki(**market, collusion_monitor=monitor)
+        online_verdict = monitor.finish(online_iterations, buyer_shares)
+        online_seconds = time.perf_counter() - start
+    print(f"after the run: {iterations:4d} iterations, {offline_seconds * 1e3:7.2f} ms, collusion={verdict}")
+    print(f"online:        {online_iterations:4d} iterations, {online_seconds * 1e3:7.2f} ms, collusion={online_verdict}")
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_chain_log(BASE_DIR, num_blocks)
+            energy_chain = load_blockchain(BASE_DIR)
+        start = time.perf_counter()
+        scan = scan_chain_collusion(energy_chain.iter_blocks())
+        print(f"chain scan of {num_blocks} blocks: {time.perf_counter() - start:.2f}s, "
+              f"{int(scan['suspicious'].sum())} suspicious, longest run {scan['longest_suspicious_run']}")
+
+
+if __name__ == "__main__":
+    main()
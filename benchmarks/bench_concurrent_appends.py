@@ -0,0 +1,86 @@
+"""Benchmark: several processes / threads appending to one chain.
+
+Checks that concurrent market-clearing processes sharing a BASE_DIR produce one consistent
+chain, and compares per-block commits with group commits through GroupCommitWriter.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent_appends [processes] [blocks_per_producer]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import EnergyBlockchain, GroupCommitWriter, save_blockchain
+from saki_market_game.chain_verifier import verify_chain
+
+
+def random_transactions(rng, sellers=10):
+    return {
+        "final_prices": rng.uniform(5, 15, sellers).tolist(),
+        "buyer_shares": rng.uniform(0, 5, sellers).tolist(),
+        "iterations": 42,
+        "rewards": rng.uniform(0, 0.1, sellers).tolist(),
+        "total_payment_with_reward": 1234.5,
+    }
+
+
+def producer_process(task):
+    BASE_DIR, seed, count = task
+    rng = np.random.default_rng(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        energy_chain = EnergyBlockchain(BASE_DIR)
+        for _ in range(count):
+            energy_chain.add_block(random_transactions(rng))
+        save_blockchain(energy_chain, BASE_DIR)
+    return count
+
+
+def check(BASE_DIR, expected):
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = verify_chain(BASE_DIR, processes=1, full=True)
+    return f"{report['verified']} blocks (expected {expected}), ok={report['ok']}"
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    expected = 1 + processes * count
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            list(executor.map(producer_process, [(BASE_DIR, seed, count) for seed in range(processes)]))
+        elapsed = time.perf_counter() - start
+        print(f"{processes} processes, add_block:      {elapsed:.2f}s, {check(BASE_DIR, expected)}")
+
+    rng = np.random.default_rng(0)
+    transactions = [random_transactions(rng) for _ in range(processes * count)]
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            energy_chain = EnergyBlockchain(BASE_DIR)
+            start = time.perf_counter()
+            for item in transactions:
+                energy_chain.add_blocks([item])  # One fsync per block
+            elapsed = time.perf_counter() - start
+        print(f"fsync per block:                 {elapsed:.2f}s, {check(BASE_DIR, expected)}")
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            energy_chain = EnergyBlockchain(BASE_DIR)
+            start = time.perf_counter()
+            with GroupCommitWriter(energy_chain) as writer, ThreadPoolExecutor(max_workers=processes) as producers:
+                futures = list(producers.map(writer.submit, transactions))
+            [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+        print(f"{processes} threads, group commit:     {elapsed:.2f}s in {writer.commits} commit(s), "
+              f"{check(BASE_DIR, expected)}")
+
+
+if __name__ == "__main__":
+    main()
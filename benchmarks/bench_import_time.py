@@ -0,0 +1,60 @@
+"""Benchmark: cold import time of the package and which heavy modules each import pulls in.
+
+Every import runs in a fresh interpreter. Exits with status 1 if importing the package or the
+CLI entry point loads matplotlib, pandas or tkinter, so the lazy layout stays guarded.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time [repeats]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("matplotlib", "pandas", "tkinter")
+TARGETS = [
+    ("import saki_market_game", True),
+    ("import saki_market_game.main", True),
+    ("from saki_market_game.market_runner import run_batch", True),
+    ("from saki_market_game import saki", True),
+    ("from saki_market_game import run_sweep; import pandas", False),
+    ("from saki_market_game.reports import save_market_reports; import matplotlib.figure", False),
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def time_import(statement):
+    """Returns (seconds, heavy modules loaded) for one statement in a fresh interpreter."""
+    output = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True).stdout
+    seconds, loaded = json.loads(output.splitlines()[-1])
+    return seconds, loaded
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    regressions = []
+    for statement, must_stay_light in TARGETS:
+        runs = [time_import(statement) for _ in range(repeats)]
+        median = statistics.median(seconds for seconds, _ in runs)
+        loaded = runs[-1][1]
+        print(f"{statement:<85} {median * 1e3:8.1f} ms  heavy: {', '.join(loaded) or '-'}")
+        if must_stay_light and loaded:
+            regressions.append(statement)
+
+    if regressions:
+        print(f"\n❌ Heavy modules loaded at import time by: {'; '.join(regressions)}")
+        return 1
+    print("\n✅ Package and CLI imports stay free of matplotlib, pandas and tkinter.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
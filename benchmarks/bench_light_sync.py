@@ -0,0 +1,51 @@
+"""Benchmark: light sync cost for many nodes, by how many blocks they missed.
+
+Run from the repository root:
+    python -m benchmarks.bench_light_sync [num_nodes]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import EnergyBlockchain, light_sync_for_new_nodes
+
+
+def add_blocks(energy_chain, count, sellers, rng):
+    for _ in range(count):
+        energy_chain.add_block({
+            "final_prices": rng.uniform(5, 15, sellers).tolist(),
+            "buyer_shares": rng.uniform(0, 5, sellers).tolist(),
+            "iterations": 42,
+            "rewards": rng.uniform(0, 0.1, sellers).tolist(),
+            "total_payment_with_reward": 1234.5,
+        })
+
+
+def timed_sync(label, energy_chain, num_nodes, BASE_DIR):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        light_sync_for_new_nodes(energy_chain, num_nodes, BASE_DIR)
+    print(f"{label:>28}: {time.perf_counter() - start:.3f}s")
+
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            energy_chain = EnergyBlockchain(BASE_DIR)
+            add_blocks(energy_chain, 5, 10, rng)
+        timed_sync(f"{num_nodes} new nodes", energy_chain, num_nodes, BASE_DIR)
+        timed_sync("all nodes up to date", energy_chain, num_nodes, BASE_DIR)
+        for missed in (1, 10):
+            with contextlib.redirect_stdout(io.StringIO()):
+                add_blocks(energy_chain, missed, 10, rng)
+            timed_sync(f"{missed} missed block(s)", energy_chain, num_nodes, BASE_DIR)
+
+
+if __name__ == "__main__":
+    main()
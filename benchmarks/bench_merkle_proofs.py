@@ -0,0 +1,32 @@
+"""Benchmark: checking one seller's settlement with a Merkle proof vs re-hashing the whole block.
+
+Run from the repository root:
+    python -m benchmarks.bench_merkle_proofs [num_sellers]
+"""
+import sys
+import time
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import MerkleTree, transaction_hash, verify_merkle_proof
+
+
+def main():
+    num_sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    prices = np.random.default_rng(0).uniform(5, 15, num_sellers).tolist()
+
+    start = time.perf_counter()
+    tree = MerkleTree([transaction_hash(price) for price in prices])
+    full_seconds = time.perf_counter() - start
+    print(f"full re-hash of {num_sellers} prices: {full_seconds * 1e3:.2f} ms")
+
+    seller_index = num_sellers // 2
+    proof = tree.get_proof(seller_index)
+    start = time.perf_counter()
+    ok = verify_merkle_proof(transaction_hash(prices[seller_index]), proof, tree.merkle_root)
+    proof_seconds = time.perf_counter() - start
+    print(f"inclusion proof ({len(proof)} hashes): {proof_seconds * 1e3:.3f} ms, valid={ok}")
+
+
+if __name__ == "__main__":
+    main()
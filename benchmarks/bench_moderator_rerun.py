@@ -0,0 +1,90 @@
+"""Benchmark: cost of a collusive market, full first run + moderator rerun vs early stop + moderator rerun.
+
+The first run either goes to convergence before collusion is checked, or carries a CollusionMonitor
+that stops it as soon as collusion is flagged (the clear_market() path). Both then rerun saki() with
+the moderator from the final prices, so the saving comes from the shortened first run alone.
+
+Run from the repository root:
+    python -m benchmarks.bench_moderator_rerun [num_markets]
+"""
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from saki_market_game.collusion import CollusionMonitor
+from saki_market_game.saki_core import saki
+
+
+def collusive_market(rng):
+    """Identical sellers (equal shares) with slowly moving prices."""
+    num_sellers = int(rng.integers(3, 30))
+    cost = float(rng.uniform(8, 12))
+    return dict(capacities=[float(rng.uniform(20, 60))] * num_sellers, qualities=[0.8] * num_sellers,
+                production_costs=[cost] * num_sellers, buyer_demand=float(rng.uniform(50, 200)),
+                max_profit_percentage=0.3, min_profits=[1.0] * num_sellers,
+                max_change_percentage=float(rng.uniform(0.0005, 0.002)), tolerance=0.001,
+                initial_prices=[cost * 1.05] * num_sellers)
+
+
+def moderator(market, final_prices):
+    cost = min(market["production_costs"])
+    return (max(market["capacities"]), min(0.99, max(market["qualities"])), cost, 0.0,
+            min(min(final_prices) * 0.70, cost * 1.05))
+
+
+def rerun_with_moderator(market, final_prices):
+    """Second saki() call with the moderator added, starting from the final prices of the first run."""
+    capacity, quality, cost, min_profit, price = moderator(market, final_prices)
+    rerun = dict(market, initial_prices=list(final_prices) + [price],
+                 capacities=market["capacities"] + [capacity], qualities=market["qualities"] + [quality],
+                 production_costs=market["production_costs"] + [cost],
+                 min_profits=market["min_profits"] + [min_profit])
+    final_prices, *_, iterations = saki(num_sellers=len(rerun["capacities"]), use_moderator=True,
+                                        moderator_price=price, engine="vectorized", **rerun)
+    return final_prices, iterations
+
+
+def main():
+    num_markets = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(0)
+    markets = [collusive_market(rng) for _ in range(num_markets)]
+    totals = {"full first run": [0, 0.0], "early stop": [0, 0.0]}
+    phases = {"first run": 0, "until flagged": 0, "rerun": 0}
+    price_gap = 0.0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for market in markets:
+            num_sellers = len(market["capacities"])
+
+            # First run to convergence, then the moderator rerun
+            start = time.perf_counter()
+            final_prices, *_, iterations = saki(num_sellers=num_sellers, engine="vectorized", **market)
+            full_prices, full_rerun_iterations = rerun_with_moderator(market, final_prices)
+            totals["full first run"][0] += iterations + full_rerun_iterations
+            totals["full first run"][1] += time.perf_counter() - start
+            phases["first run"] += iterations
+
+            # First run stopped when collusion is flagged, then the moderator rerun
+            start = time.perf_counter()
+            final_prices, *_, flagged_at = saki(num_sellers=num_sellers, engine="vectorized",
+                                                collusion_monitor=CollusionMonitor(num_sellers), **market)
+            early_prices, rerun_iterations = rerun_with_moderator(market, final_prices)
+            totals["early stop"][0] += flagged_at + rerun_iterations
+            totals["early stop"][1] += time.perf_counter() - start
+            phases["until flagged"] += flagged_at
+            phases["rerun"] += rerun_iterations
+            price_gap = max(price_gap, float(np.max(np.abs(np.subtract(early_prices, full_prices)))))
+
+    print(f"{num_markets} collusive markets")
+    for label, (iterations, seconds) in totals.items():
+        print(f"{label:>14}: {iterations / num_markets:7.1f} iterations/market, {seconds * 1e3:8.1f} ms")
+    print(f"largest final price difference: {price_gap:.4f}")
+    print("iterations/market by phase: " + ", ".join(f"{label} {count / num_markets:.1f}"
+                                                       for label, count in phases.items()))
+
+
+if __name__ == "__main__":
+    main()
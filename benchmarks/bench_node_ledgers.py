@@ -0,0 +1,65 @@
+"""Benchmark: disk use and write time of one block's node ledger fan-out.
+
+Compares the content-addressed store (one blob + hardlinks) with writing a full copy per node.
+
+Run from the repository root:
+    python -m benchmarks.bench_node_ledgers [num_sellers]
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import EnergyBlockchain
+
+
+def unique_bytes(path):
+    """Bytes used by distinct files under path (hardlinks counted once)."""
+    seen, total = set(), 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            if stat.st_ino not in seen:
+                seen.add(stat.st_ino)
+                total += stat.st_size
+    return total
+
+
+def main():
+    num_sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    transactions = {
+        "final_prices": rng.uniform(5, 15, num_sellers).tolist(),
+        "buyer_shares": rng.uniform(0, 5, num_sellers).tolist(),
+        "iterations": 42,
+        "rewards": rng.uniform(0, 0.1, num_sellers).tolist(),
+        "total_payment_with_reward": 1234.5,
+    }
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        with contextlib.redirect_stdout(io.StringIO()):
+            energy_chain = EnergyBlockchain(BASE_DIR)
+            start = time.perf_counter()
+            energy_chain.add_block(transactions)
+            elapsed = time.perf_counter() - start
+        print(f"content-addressed: {elapsed:.3f}s, {unique_bytes(BASE_DIR) / 1e6:.2f} MB")
+
+    with tempfile.TemporaryDirectory() as BASE_DIR:
+        payload = {"index": 1, "transactions": transactions, "block_hash": "0" * 64}
+        start = time.perf_counter()
+        for i in range(num_sellers):
+            node_ledger_dir = os.path.join(BASE_DIR, f"Node_{i + 1}_ledger")
+            os.makedirs(node_ledger_dir, exist_ok=True)
+            with open(os.path.join(node_ledger_dir, "block_1_ledger.json"), "w") as node_file:
+                json.dump(payload, node_file, indent=4)
+        elapsed = time.perf_counter() - start
+        print(f"full copy per node: {elapsed:.3f}s, {unique_bytes(BASE_DIR) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
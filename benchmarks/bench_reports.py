@@ -0,0 +1,74 @@
+"""Benchmark: report generation cost and how much of it background rendering hides.
+
+Times save_market_reports() per table format with full and downsampled plots, then a batch of
+markets with synchronous reports vs a ReportWriter rendering them in the background.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports [num_sellers] [iterations] [markets]
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_saki_engine import random_market
+from saki_market_game.reports import ReportWriter, TABLE_FORMATS, save_market_reports
+from saki_market_game.saki_core import saki
+
+
+def random_history(num_sellers, iterations, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 10 + np.cumsum(rng.normal(0, 0.05, (iterations, num_sellers)), axis=0)
+    shares = rng.uniform(0, 5, (iterations, num_sellers))
+    return prices, shares
+
+
+def time_reports(label, base_dir, num_sellers, prices, shares, **options):
+    start = time.perf_counter()
+    save_market_reports(base_dir, label, num_sellers, prices, shares, **options)
+    print(f"{label:>30}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+
+def clear_markets(markets, num_sellers, report):
+    for market in range(markets):
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, _, price_history, share_history, _ = saki(**random_market(num_sellers, seed=market), engine="vectorized")
+        report(market, price_history, share_history)
+
+
+def main():
+    num_sellers = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    markets = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    prices, shares = random_history(num_sellers, iterations)
+    print(f"One report: {num_sellers} sellers, {iterations} iterations")
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        time_reports("xlsx, full plots", base_dir, num_sellers, prices, shares, max_plot_points=iterations)
+        for table_format in TABLE_FORMATS:
+            try:
+                time_reports(f"{table_format}, downsampled plots", base_dir, num_sellers, prices, shares,
+                             table_format=table_format)
+            except ValueError as error:
+                print(f"{table_format + ', downsampled plots':>30}: skipped ({error})")
+
+        print(f"\n{markets} markets with {num_sellers} sellers, xlsx reports")
+        start = time.perf_counter()
+        clear_markets(markets, num_sellers, lambda market, p, s: save_market_reports(
+            base_dir, f"sync_{market}", num_sellers, p, s))
+        print(f"{'synchronous':>30}: {time.perf_counter() - start:9.2f} s")
+
+        start = time.perf_counter()
+        with ReportWriter() as writer:
+            clear_markets(markets, num_sellers, lambda market, p, s: writer.submit(
+                base_dir, f"background_{market}", num_sellers, p, s))
+            cleared = time.perf_counter() - start
+        print(f"{'background (markets cleared)':>30}: {cleared:9.2f} s")
+        print(f"{'background (reports done)':>30}: {time.perf_counter() - start:9.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark: PoCC reward settlement for many markets, one call per market vs one batched call.
+
+Run from the repository root:
+    python -m benchmarks.bench_rewards_batch [num_markets] [sellers_per_market]
+"""
+import sys
+import time
+
+import numpy as np
+
+from saki_market_game.blockchain_engine import (
+    distribute_rewards_batch, distribute_rewards_v2, pocc_weighted_utility
+)
+
+
+def main():
+    num_markets = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_sellers = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = np.random.default_rng(0)
+    shape = (num_markets, num_sellers)
+    prices = rng.uniform(5, 15, shape)
+    buyer_shares = rng.uniform(0, 5, shape)
+    qualities = rng.uniform(0.5, 1.0, shape)
+    production_costs = prices * rng.uniform(0.5, 1.0, shape)
+    weighted_utility = pocc_weighted_utility(prices, buyer_shares, qualities)
+
+    start = time.perf_counter()
+    loop_rewards = np.array([
+        distribute_rewards_v2(prices[k], buyer_shares[k], weighted_utility[k], qualities[k],
+                              production_costs[k], num_sellers, verbose=False)[0]
+        for k in range(num_markets)
+    ])
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    settlement = distribute_rewards_batch(prices, buyer_shares, weighted_utility, qualities, production_costs)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"{num_markets} markets × {num_sellers} sellers")
+    print(f"per-market calls: {loop_seconds * 1e3:9.2f} ms")
+    print(f"batched:          {batch_seconds * 1e3:9.2f} ms  (same rewards: "
+          f"{np.allclose(loop_rewards, settlement['rewards'])})")
+
+
+if __name__ == "__main__":
+    main()
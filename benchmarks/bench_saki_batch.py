@@ -0,0 +1,59 @@
+"""Benchmark: clearing many small markets with saki_batch() vs. one saki() call per market.
+
+Run from the repository root:
+    python -m benchmarks.bench_saki_batch
+"""
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from benchmarks.bench_saki_engine import random_market
+from saki_market_game.saki_batch import saki_batch, stack_markets
+from saki_market_game.saki_core import saki
+
+MARKET_COUNTS = [10, 100, 1000]
+SELLERS_PER_MARKET = (3, 20)  # Uneven market sizes, padded by stack_markets
+
+
+def build_markets(num_markets, seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(*SELLERS_PER_MARKET, num_markets)
+    return [random_market(int(size), seed=seed + k) for k, size in enumerate(sizes)]
+
+
+def run_sequential(markets):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [saki(**market, engine="vectorized") for market in markets]
+
+
+def run_batch(markets):
+    def stacked(key):
+        return stack_markets([market[key] for market in markets])
+
+    capacities, seller_mask = stacked("capacities")
+    return saki_batch(
+        capacities, stacked("qualities")[0], stacked("production_costs")[0],
+        [market["buyer_demand"] for market in markets], markets[0]["max_profit_percentage"],
+        stacked("min_profits")[0], markets[0]["max_change_percentage"], stacked("initial_prices")[0],
+        seller_mask=seller_mask,
+    )
+
+
+def main():
+    print(f"{'markets':>8} {'saki() x N (s)':>16} {'saki_batch (s)':>15} {'speedup':>8} {'markets/s':>10}")
+    for num_markets in MARKET_COUNTS:
+        markets = build_markets(num_markets)
+        start = time.perf_counter()
+        run_sequential(markets)
+        sequential_time = time.perf_counter() - start
+        start = time.perf_counter()
+        run_batch(markets)
+        batch_time = time.perf_counter() - start
+        print(f"{num_markets:>8} {sequential_time:>16.3f} {batch_time:>15.4f} "
+              f"{sequential_time / batch_time:>7.1f}x {num_markets / batch_time:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
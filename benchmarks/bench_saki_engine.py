@@ -0,0 +1,78 @@
+"""Benchmark: runtime of saki() vs. seller count for the loop and vectorized engines.
+
+Also checks parity: exits with status 1 if the engines' final prices differ by TOLERANCE or more,
+or if they need a different number of iterations.
+
+Run from the repository root:
+    python -m benchmarks.bench_saki_engine
+"""
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from saki_market_game.saki_core import saki
+
+SELLER_COUNTS = [10, 100, 1000, 5000]
+LOOP_MAX_SELLERS = 5000  # The loop engine still steps through sellers in Python; skip it beyond this size
+MAX_ITERATIONS = 1000
+TOLERANCE = 0.01  # saki() default; the engines must agree on final prices within it
+
+
+def random_market(num_sellers, seed=0):
+    """Builds a reproducible random market with valid initial prices."""
+    rng = np.random.default_rng(seed)
+    production_costs = rng.uniform(5, 15, num_sellers)
+    capacities = rng.uniform(50, 150, num_sellers)
+    qualities = rng.uniform(0.5, 1, num_sellers)
+    max_profit_percentage = 0.5
+    initial_prices = production_costs * (1 + rng.uniform(0, max_profit_percentage, num_sellers))
+    return dict(
+        num_sellers=num_sellers,
+        capacities=capacities.tolist(),
+        qualities=qualities.tolist(),
+        production_costs=production_costs.tolist(),
+        buyer_demand=2.5 * num_sellers,
+        max_profit_percentage=max_profit_percentage,
+        min_profits=[0.0] * num_sellers,
+        max_change_percentage=0.1,
+        initial_prices=initial_prices.tolist(),
+        max_iterations=MAX_ITERATIONS,
+    )
+
+
+def time_engine(market, engine):
+    """Returns (seconds, iterations, final prices) for one saki() run with console output muted."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        final_prices, _, _, _, iterations = saki(**market, engine=engine)
+    return time.perf_counter() - start, iterations, np.array(final_prices)
+
+
+def main():
+    mismatches = []
+    print(f"{'sellers':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>8} {'max |Δp|':>10} {'iters':>11}")
+    for num_sellers in SELLER_COUNTS:
+        market = random_market(num_sellers)
+        vec_time, vec_iterations, vec_prices = time_engine(market, "vectorized")
+        if num_sellers <= LOOP_MAX_SELLERS:
+            loop_time, loop_iterations, loop_prices = time_engine(market, "loop")
+            max_diff = float(np.max(np.abs(loop_prices - vec_prices)))
+            print(f"{num_sellers:>8} {loop_time:>10.3f} {vec_time:>15.4f} {loop_time / vec_time:>7.1f}x {max_diff:>10.4f} "
+                  f"{loop_iterations:>5}/{vec_iterations:<5}")
+            if max_diff >= TOLERANCE or loop_iterations != vec_iterations:
+                mismatches.append(num_sellers)
+        else:
+            print(f"{num_sellers:>8} {'-':>10} {vec_time:>15.4f} {'-':>8} {'-':>10} {'-':>5}/{vec_iterations:<5}")
+
+    if mismatches:
+        print(f"\n❌ Engines disagree for {', '.join(map(str, mismatches))} seller(s).")
+        return 1
+    print(f"\n✅ Loop and vectorized engines agree (max |Δp| < {TOLERANCE}, same iteration counts).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
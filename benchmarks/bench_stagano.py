@@ -0,0 +1,82 @@
+"""Benchmark: license hash extraction from a WAV file, full-read reference vs. chunked extract_hidden_hash.
+
+The reference is the original implementation (all frames in memory, one bit string per
+sample). Both are timed on the same file and their peak Python allocations compared.
+
+Run from the repository root:
+    python -m benchmarks.bench_stagano [seconds_of_audio]
+"""
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+from stagano import extract_hidden_hash
+
+SAMPLE_RATE = 44100
+
+
+def reference_extract_hidden_hash(audio_path):
+    """The original full-read implementation, kept for comparison."""
+    with wave.open(audio_path, 'rb') as audio:
+        frames = bytearray(audio.readframes(audio.getnframes()))
+    binary_data = ''.join(str(sample & 1) for sample in frames[:len(frames) // 8])
+    byte_chunks = [binary_data[i:i+8] for i in range(0, len(binary_data), 8)]
+    extracted_text = ''.join(chr(int(byte, 2)) for byte in byte_chunks)
+    end_marker = extracted_text.find("EOF")
+    if end_marker != -1:
+        extracted_text = extracted_text[:end_marker]
+    short_hash, encoded_hash = extracted_text[:8], extracted_text[8:]
+    try:
+        full_hash = base64.b64decode(encoded_hash).decode('utf-8')
+    except Exception:
+        full_hash = None
+    return short_hash, full_hash
+
+
+def write_license_wav(path, seconds, seed=0):
+    """Stereo 16-bit noise with a license hash hidden in the LSBs of the first data bytes."""
+    full_hash = hashlib.sha256(b"saki").hexdigest()
+    payload = (full_hash[:8] + base64.b64encode(full_hash.encode()).decode() + "EOF").encode()
+    data = np.random.default_rng(seed).integers(0, 256, seconds * SAMPLE_RATE * 4, dtype=np.uint8)
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    data[:len(bits)] = (data[:len(bits)] & 0xFE) | bits
+    with wave.open(path, "wb") as audio:
+        audio.setnchannels(2)
+        audio.setsampwidth(2)
+        audio.setframerate(SAMPLE_RATE)
+        audio.writeframes(data.tobytes())
+    return full_hash
+
+
+def measure(label, extract, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = extract(path)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<12} {seconds * 1e3:10.1f} ms   peak {peak / 2**20:8.2f} MiB")
+    return result
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "license.wav")
+        full_hash = write_license_wav(path, seconds)
+        print(f"{seconds} s stereo 16-bit WAV ({os.path.getsize(path) / 2**20:.1f} MiB)")
+        reference = measure("reference", reference_extract_hidden_hash, path)
+        chunked = measure("chunked", extract_hidden_hash, path)
+    assert chunked == reference and chunked[1] == full_hash, "extract_hidden_hash output differs"
+    print("✅ Identical output.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,50 @@
-from .input_handler import get_user_input
-from .saki_core import saki, initialize_prices
-from .blockchain_engine import (
-    EnergyBlockchain, save_blockchain, load_blockchain,
-    initialize_seller_nodes, light_sync_for_new_nodes,
-    distribute_rewards_v2
-)
+import importlib
+
+# saki_batch is imported eagerly: the function shares its name with the submodule, so a lazy
+# lookup would return the module once another submodule has imported it
+from .saki_batch import saki_batch, stack_markets
+
+# 🔹 Public names -> submodule; each submodule is imported on first access (PEP 562)
+_LAZY_EXPORTS = {
+    "get_user_input": "input_handler",
+    "saki": "saki_core",
+    "initialize_prices": "saki_core",
+    "MarketHistory": "market_history",
+    "detect_collusion": "collusion",
+    "CollusionMonitor": "collusion",
+    "scan_chain_collusion": "collusion",
+    "parameter_grid": "scenario_sweep",
+    "monte_carlo_points": "scenario_sweep",
+    "run_sweep": "scenario_sweep",
+    "EquilibriumCache": "equilibrium_cache",
+    "EnergyBlockchain": "blockchain_engine",
+    "save_blockchain": "blockchain_engine",
+    "load_blockchain": "blockchain_engine",
+    "export_blockchain_json": "blockchain_engine",
+    "initialize_seller_nodes": "blockchain_engine",
+    "light_sync_for_new_nodes": "blockchain_engine",
+    "distribute_rewards_v2": "blockchain_engine",
+    "distribute_rewards_batch": "blockchain_engine",
+    "pocc_weighted_utility": "blockchain_engine",
+    "MerkleTree": "blockchain_engine",
+    "verify_merkle_proof": "blockchain_engine",
+    "verify_seller_settlement": "blockchain_engine",
+    "GroupCommitWriter": "blockchain_engine",
+    "verify_chain": "chain_verifier",
+    "ChainIndex": "chain_index",
+}
+
+__all__ = ["saki_batch", "stack_markets"] + list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
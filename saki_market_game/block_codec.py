@@ -0,0 +1,142 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
+
+MAGIC = b"SKB"  # Binary block records start with these bytes; JSON records start with "{" or "["
+VERSION = 1
+COMPRESSION_CODES = {None: 0, "zlib": 1, "zstd": 2}
+BLOCK_FORMATS = ("json", "binary")
+FILE_EXTENSIONS = {"json": ".json", "binary": ".skb"}
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+# 🔹 Value encoding (msgpack-style tags; float lists become raw float64 arrays)
+def _encode_value(value, out):
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        if -2 ** 63 <= value < 2 ** 63:
+            out += b"i" + _I64.pack(value)
+        else:
+            text = str(value).encode()
+            out += b"I" + _U32.pack(len(text)) + text
+    elif isinstance(value, float):
+        out += b"f" + _F64.pack(value)
+    elif isinstance(value, str):
+        text = value.encode("utf-8")
+        out += b"s" + _U32.pack(len(text)) + text
+    elif isinstance(value, (list, tuple)):
+        if value and all(type(v) is float for v in value):
+            out += b"a" + _U32.pack(len(value)) + np.asarray(value, dtype="<f8").tobytes()
+        else:
+            out += b"l" + _U32.pack(len(value))
+            for item in value:
+                _encode_value(item, out)
+    elif isinstance(value, dict):
+        out += b"d" + _U32.pack(len(value))
+        for key, item in value.items():
+            key = str(key).encode("utf-8")
+            out += _U32.pack(len(key)) + key
+            _encode_value(item, out)
+    elif isinstance(value, np.generic):
+        _encode_value(value.item(), out)
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__} in a block record")
+
+
+def _decode_value(data, offset):
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _I64.unpack_from(data, offset)[0], offset + 8
+    if tag == b"f":
+        return _F64.unpack_from(data, offset)[0], offset + 8
+    (length,) = _U32.unpack_from(data, offset)
+    offset += 4
+    if tag == b"I":
+        return int(bytes(data[offset:offset + length])), offset + length
+    if tag == b"s":
+        return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+    if tag == b"a":
+        end = offset + 8 * length
+        return np.frombuffer(data[offset:end], dtype="<f8").tolist(), end
+    if tag == b"l":
+        items = []
+        for _ in range(length):
+            item, offset = _decode_value(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == b"d":
+        result = {}
+        for _ in range(length):
+            (key_length,) = _U32.unpack_from(data, offset)
+            offset += 4
+            key = bytes(data[offset:offset + key_length]).decode("utf-8")
+            offset += key_length
+            result[key], offset = _decode_value(data, offset)
+        return result, offset
+    raise ValueError(f"Unknown tag {tag!r} in binary block record")
+
+
+# 🔹 Block record encoding
+def encode_block(record, block_format="json", compression=None):
+    """
+    Encodes a block record (dict) as bytes.
+
+    block_format "json" gives compact JSON; "binary" gives the tagged binary encoding with
+    float lists stored as raw float64 arrays, optionally compressed with "zlib" or "zstd".
+    """
+    if block_format == "json":
+        return json.dumps(record, separators=(",", ":")).encode("utf-8")
+    if block_format != "binary":
+        raise ValueError(f"Unknown block format: {block_format!r} (expected one of {BLOCK_FORMATS})")
+    if compression not in COMPRESSION_CODES:
+        raise ValueError(f"Unknown compression: {compression!r} (expected None, 'zlib' or 'zstd')")
+
+    body = bytearray()
+    _encode_value(record, body)
+    if compression == "zlib":
+        body = zlib.compress(bytes(body))
+    elif compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package.")
+        body = zstandard.ZstdCompressor().compress(bytes(body))
+    return MAGIC + bytes([VERSION, COMPRESSION_CODES[compression]]) + bytes(body)
+
+
+def decode_block(payload):
+    """Decodes bytes produced by encode_block (the format is detected from the payload)."""
+    if not payload.startswith(MAGIC):
+        return json.loads(bytes(payload).decode("utf-8"))
+    version, compression_code = payload[3], payload[4]
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary block version: {version}")
+    body = payload[5:]
+    if compression_code == COMPRESSION_CODES["zlib"]:
+        body = zlib.decompress(body)
+    elif compression_code == COMPRESSION_CODES["zstd"]:
+        if zstandard is None:
+            raise ValueError("Reading zstd-compressed blocks requires the 'zstandard' package.")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    value, _ = _decode_value(memoryview(body), 0)
+    return value
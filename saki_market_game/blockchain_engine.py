@@ -1,219 +1,718 @@
 import hashlib
 import json
 import os
+import queue
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
 import numpy as np
 
+from .block_codec import encode_block, FILE_EXTENSIONS
+from .chain_index import ChainIndex
+from .chain_store import BlockLog, store_object, link_object
+
 # 🔹 Create seller node folders
 def initialize_seller_nodes(num_sellers, BASE_DIR):
     for i in range(num_sellers):
         node_dir = os.path.join(BASE_DIR, f"Node_{i + 1}_ledger")
         os.makedirs(node_dir, exist_ok=True)
 
-# 🔹 Light sync: only latest block to each node
-def light_sync_for_new_nodes(energy_chain, num_sellers, BASE_DIR):
-    latest_block_index = len(energy_chain.chain) - 1
-    block_folder = os.path.join(BASE_DIR, f"Block_{latest_block_index}")
-    block_file = os.path.join(block_folder, "block_data.json")
-
-    if os.path.exists(block_file):
-        with open(block_file, "r") as file:
-            latest_block_data = json.load(file)
-
-        for i in range(num_sellers):
-            node_ledger_dir = os.path.join(BASE_DIR, f"Node_{i + 1}_ledger")
-            os.makedirs(node_ledger_dir, exist_ok=True)
-            node_ledger_file = os.path.join(node_ledger_dir, f"latest_block_ledger.json")
+# 🔹 Light sync: deltas since each node's last synced height
+SYNC_MANIFEST = "node_sync_manifest.json"  # {"Node_<i>": last synced block index}
+HEADERS_FILE = "headers.jsonl"  # Per node: one block header (+ the node's Merkle proof) per line
+
+def load_sync_manifest(BASE_DIR):
+    path = os.path.join(BASE_DIR, SYNC_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except json.JSONDecodeError:
+        print("⚠ Node sync manifest corrupted. Nodes will be light-synced from the latest block.")
+        return {}
+
+def _save_sync_manifest(BASE_DIR, manifest):
+    """Atomically replaces the manifest (per-process temp file, then os.replace); call with the chain lock held."""
+    path = os.path.join(BASE_DIR, SYNC_MANIFEST)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
 
-            with open(node_ledger_file, "w") as node_file:
-                json.dump(latest_block_data, node_file, indent=4)
+def light_sync_for_new_nodes(energy_chain, num_sellers, BASE_DIR):
+    """
+    Brings the ledgers of nodes 1..num_sellers up to the chain tip.
+
+    New nodes only receive the latest block. Returning nodes receive the header of every
+    block they missed (plus a Merkle proof of their own price where they were a seller),
+    appended to headers.jsonl in one write per node; nodes already at the tip are skipped.
+    Last synced heights are kept in node_sync_manifest.json. The whole manifest read-update-write
+    runs under the chain lock, so processes sharing BASE_DIR never overwrite each other's heights.
+    """
+    with energy_chain.store.lock:
+        energy_chain._refresh()  # Sync to the tip as other processes left it
+        _light_sync_nodes(energy_chain, num_sellers, BASE_DIR)
+
+def _light_sync_nodes(energy_chain, num_sellers, BASE_DIR):
+    latest_block_index = energy_chain.chain[-1].index
+    manifest = load_sync_manifest(BASE_DIR)
+    heights = {}
+    for i in range(num_sellers):
+        height = manifest.get(f"Node_{i + 1}", latest_block_index - 1)  # New node: latest block only
+        if height < latest_block_index:
+            heights[i] = height
+
+    if not heights:
+        print("✅ Light sync: all nodes are up to date.")
+        return
+
+    # Header lines of the missed range are built once and shared by every node that missed them
+    updates = {i: [] for i in heights}
+    headers_sent = 0
+    for block in energy_chain.iter_blocks(min(heights.values()) + 1):
+        header = block.header()
+        header_line = json.dumps({"header": header})
+        participants = len(block.transactions.get("final_prices", [])) if isinstance(block.transactions, dict) else 0
+        for i, height in heights.items():
+            if height >= block.index:
+                continue
+            if i < participants:
+                updates[i].append(json.dumps({"header": header, "proof": block.merkle_proof(i)}))
+            else:
+                updates[i].append(header_line)
+            headers_sent += 1
 
-    print("✅ Light sync completed for new nodes.")
+    block_folder = os.path.join(BASE_DIR, f"Block_{latest_block_index}")
+    latest_block_object = latest_extension = None
+    for extension in FILE_EXTENSIONS.values():
+        block_file = os.path.join(block_folder, f"block_data{extension}")
+        if os.path.exists(block_file):
+            with open(block_file, "rb") as file:
+                latest_block_object = store_object(BASE_DIR, file.read())  # One copy shared by every node
+            latest_extension = extension
+            break
+
+    for i, lines in updates.items():
+        node_ledger_dir = os.path.join(BASE_DIR, f"Node_{i + 1}_ledger")
+        os.makedirs(node_ledger_dir, exist_ok=True)
+        with open(os.path.join(node_ledger_dir, HEADERS_FILE), "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        if latest_block_object is not None:
+            node_ledger_file = os.path.join(node_ledger_dir, f"latest_block_ledger{latest_extension}")
+            link_object(BASE_DIR, latest_block_object, node_ledger_file)
+        manifest[f"Node_{i + 1}"] = latest_block_index
+    _save_sync_manifest(BASE_DIR, manifest)
+
+    print(f"✅ Light sync completed: {len(updates)} node(s) updated, {headers_sent} block header(s) sent.")
 
 # 🔹 Distribute rewards with PoCC
-def distribute_rewards_v2(prices, buyer_shares, weighted_utility, qualities, production_costs, num_sellers):
+REWARD_FEE = 0.01  # Share of the transaction amount paid into the reward pool
+BASE_WEIGHT, EFFICIENCY_WEIGHT, FAIRNESS_WEIGHT = 0.80, 0.15, 0.05
+
+def pocc_weighted_utility(prices, buyer_shares, qualities, seller_mask=None):
+    """
+    Normalized quality-per-price utility weighted by buyer share, for stacked markets
+    (markets × sellers). Markets without a positive price fall back to equal weights.
+    """
+    prices = np.array(prices, dtype=float, ndmin=2)
+    seller_mask = np.ones(prices.shape, dtype=bool) if seller_mask is None else np.asarray(seller_mask, dtype=bool)
+    valid = seller_mask & (np.nan_to_num(prices) > 0)
+    safe_prices = np.where(valid, prices, 1.0)
+    utility = np.where(valid, np.array(qualities, dtype=float, ndmin=2) / safe_prices
+                       * np.array(buyer_shares, dtype=float, ndmin=2), 0.0)
+    total = utility.sum(axis=1, keepdims=True)
+    equal = seller_mask / np.maximum(seller_mask.sum(axis=1, keepdims=True), 1)
+    return np.where(total > 0, utility / np.where(total > 0, total, 1.0), equal)
+
+def distribute_rewards_batch(prices, buyer_shares, weighted_utility, qualities, production_costs, seller_mask=None):
+    """
+    PoCC reward settlement for many markets in one vectorized pass (no printing).
+
+    Every argument is a (markets × sellers) array; padded sellers are marked False in
+    seller_mask (see saki_batch.stack_markets) and receive no reward.
+
+    Returns:
+    - settlement (dict of ndarrays): "rewards", "base_rewards", "efficiency_rewards" and
+      "fairness_rewards" (markets × sellers); "total_payment", "reward_pool" and
+      "total_payment_with_reward" (markets,). Markets without transactions get zeros.
+    """
     epsilon = 1e-9
-    total_payment = sum(np.array(prices) * np.array(buyer_shares))
-
-    if total_payment == 0:
-        print("⚠ Warning: No transactions occurred. No rewards distributed.")
-        return np.zeros(num_sellers), 0
-
-    profits = np.array(prices) * np.array(buyer_shares) - np.array(production_costs) * np.array(buyer_shares)
-    total_profit = max(sum(profits), epsilon)
-    reward_pool = 0.01 * total_payment
-    total_payment_with_reward = total_payment + reward_pool
-
-    total_utility = max(sum(weighted_utility), epsilon)
-    normalized_utility = weighted_utility / total_utility
-    total_supply = max(sum(buyer_shares), epsilon)
-    normalized_supply = buyer_shares / total_supply
-    normalized_profits = profits / total_profit
-    total_quality = max(sum(qualities), epsilon)
-    normalized_qualities = np.array(qualities) / total_quality
-
-    base_rewards = reward_pool * 0.80 * (normalized_utility * normalized_supply)
-    efficiency_rewards = reward_pool * 0.15 * normalized_profits
-    fairness_rewards = reward_pool * 0.05 * normalized_qualities
-
-    total_rewards = base_rewards + efficiency_rewards + fairness_rewards
-
+    prices = np.array(prices, dtype=float, ndmin=2)
+    seller_mask = np.ones(prices.shape, dtype=bool) if seller_mask is None else np.asarray(seller_mask, dtype=bool)
+
+    def masked(values):
+        return np.where(seller_mask, np.array(values, dtype=float, ndmin=2), 0.0)
+
+    prices, buyer_shares = masked(prices), masked(buyer_shares)
+    weighted_utility, qualities, production_costs = masked(weighted_utility), masked(qualities), masked(production_costs)
+
+    payments = prices * buyer_shares
+    total_payment = payments.sum(axis=1)
+    traded = (total_payment != 0)[:, None]
+    profits = payments - production_costs * buyer_shares
+    reward_pool = REWARD_FEE * total_payment
+
+    def normalized(values):
+        return values / np.maximum(values.sum(axis=1, keepdims=True), epsilon)
+
+    pool = reward_pool[:, None]
+    base_rewards = np.where(traded, pool * BASE_WEIGHT * normalized(weighted_utility) * normalized(buyer_shares), 0.0)
+    efficiency_rewards = np.where(traded, pool * EFFICIENCY_WEIGHT * normalized(profits), 0.0)
+    fairness_rewards = np.where(traded, pool * FAIRNESS_WEIGHT * normalized(qualities), 0.0)
+
+    return {
+        "rewards": base_rewards + efficiency_rewards + fairness_rewards,
+        "base_rewards": base_rewards,
+        "efficiency_rewards": efficiency_rewards,
+        "fairness_rewards": fairness_rewards,
+        "total_payment": total_payment,
+        "reward_pool": reward_pool,
+        "total_payment_with_reward": np.where(traded[:, 0], total_payment + reward_pool, 0.0),
+    }
+
+def print_reward_report(rewards, total_payment_with_reward, reward_pool):
+    """Prints the reward distribution of one market."""
     print("\n🏆 Final Reward Distribution Results:")
     print(f"🔹 Total Transaction Amount (with 1% Reward Fee): {total_payment_with_reward:.2f}")
     print(f"🔹 Total Rewards Distributed: {reward_pool:.2f}")
     print("\n🎖 Sellers & Their Rewards:")
-    for i in range(num_sellers):
-        print(f"🔹 Seller {i+1}: Final Reward = {total_rewards[i]:.4f}")
+    for i, reward in enumerate(rewards):
+        print(f"🔹 Seller {i+1}: Final Reward = {reward:.4f}")
+
+def distribute_rewards_v2(prices, buyer_shares, weighted_utility, qualities, production_costs, num_sellers, verbose=True):
+    """Single-market PoCC rewards (a one-row distribute_rewards_batch); verbose prints the report."""
+    settlement = distribute_rewards_batch(prices, buyer_shares, weighted_utility, qualities, production_costs)
+    if settlement["total_payment"][0] == 0:
+        if verbose:
+            print("⚠ Warning: No transactions occurred. No rewards distributed.")
+        return np.zeros(num_sellers), 0
 
+    total_rewards = settlement["rewards"][0]
+    total_payment_with_reward = float(settlement["total_payment_with_reward"][0])
+    if verbose:
+        print_reward_report(total_rewards, total_payment_with_reward, float(settlement["reward_pool"][0]))
     return total_rewards, total_payment_with_reward
 
 # 🔹 Merkle Tree
+# Version 1 (blocks written before proofs existed) hashed concatenated hex strings;
+# version 2 hashes the concatenated 32-byte digests. Blocks record their version.
+MERKLE_VERSION = 2
+
+def _hash_pair(pair, version):
+    """Parent hash of a 64-byte left+right pair of child digests."""
+    if version == 1:
+        return hashlib.sha256(pair.hex().encode()).digest()
+    return hashlib.sha256(pair).digest()
+
+def transaction_hash(transaction):
+    return hashlib.sha256(json.dumps(transaction).encode()).hexdigest()
+
 class MerkleTree:
-    def __init__(self, transactions):
+    def __init__(self, transactions, version=MERKLE_VERSION):
+        """
+        Iterative Merkle tree over leaf hashes (hex strings). Every level is kept as an
+        (n, 32) uint8 array of digests, so inclusion proofs are read off without rehashing.
+        Odd levels pair their last node with itself.
+        """
         self.transactions = transactions
-        self.merkle_root = self.build_merkle_tree(transactions)
-
-    def build_merkle_tree(self, transactions):
-        if not transactions:
-            return None
-        if len(transactions) == 1:
-            return transactions[0]
-        new_level = []
-        for i in range(0, len(transactions), 2):
-            left = transactions[i]
-            right = transactions[i + 1] if i + 1 < len(transactions) else left
-            combined = hashlib.sha256((left + right).encode()).hexdigest()
-            new_level.append(combined)
-        return self.build_merkle_tree(new_level) if len(new_level) > 1 else new_level[0]
+        self.version = version
+        self.levels = []
+        if transactions:
+            level = np.frombuffer(bytes.fromhex("".join(transactions)), dtype=np.uint8).reshape(-1, 32)
+            self.levels.append(level)
+            while len(level) > 1:
+                data = level.tobytes()
+                if len(level) % 2:
+                    data += data[-32:]
+                parents = b"".join(_hash_pair(data[i:i + 64], version) for i in range(0, len(data), 64))
+                level = np.frombuffer(parents, dtype=np.uint8).reshape(-1, 32)
+                self.levels.append(level)
+        self.merkle_root = self.levels[-1][0].tobytes().hex() if self.levels else None
 
     def get_merkle_root(self):
         return self.merkle_root
 
+    def get_proof(self, position):
+        """
+        Returns the inclusion proof of leaf position: a list of [sibling hash, sibling_is_right]
+        pairs from the leaf level up to (not including) the root.
+        """
+        if not 0 <= position < len(self.transactions):
+            raise IndexError(f"Leaf {position} out of range (tree has {len(self.transactions)} leaves).")
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling >= len(level):
+                sibling = position  # Last node of an odd level is paired with itself
+            proof.append([level[sibling].tobytes().hex(), position % 2 == 0])
+            position //= 2
+        return proof
+
+def verify_merkle_proof(leaf_hash, proof, merkle_root, version=MERKLE_VERSION):
+    """Checks an inclusion proof from MerkleTree.get_proof in O(log n) hashes."""
+    node = bytes.fromhex(leaf_hash)
+    for sibling, sibling_is_right in proof:
+        sibling = bytes.fromhex(sibling)
+        node = _hash_pair(node + sibling if sibling_is_right else sibling + node, version)
+    return node.hex() == merkle_root
+
+def block_header_hash(index, timestamp, merkle_root, previous_hash):
+    """Block hash from the header fields alone (what a light client needs to check a block)."""
+    block_content = json.dumps({
+        "index": index,
+        "timestamp": timestamp,
+        "merkle_root": merkle_root,
+        "previous_hash": previous_hash
+    }, sort_keys=True)
+    return hashlib.sha256(block_content.encode()).hexdigest()
+
 # 🔹 Block structure
+_NOT_COMPUTED = object()  # Merkle root of a loaded block that has not been needed yet
+
 class EnergyBlock:
-    def __init__(self, index, timestamp, transactions, previous_hash, BASE_DIR):
+    def __init__(self, index, timestamp, transactions, previous_hash, BASE_DIR, block_format="json", compression=None):
         self.index = index
         self.timestamp = timestamp
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.BASE_DIR = BASE_DIR
+        self.block_format = block_format  # "json" (indented files) or "binary" (compact .skb files)
+        self.compression = compression
+        self.merkle_version = MERKLE_VERSION
+        self.legacy_index = None  # Index the hash was computed over, for renumbered legacy blocks
 
-        if isinstance(transactions, dict) and "final_prices" in transactions:
-            tx_hashes = [hashlib.sha256(json.dumps(tx).encode()).hexdigest() for tx in transactions["final_prices"]]
-            self.merkle_tree = MerkleTree(tx_hashes)
-            self.merkle_root = self.merkle_tree.get_merkle_root()
-        else:
-            self.merkle_root = None
-
+        self.merkle_root = self.compute_merkle_root()
         self.block_hash = self.calculate_hash()
         self.save_block()
 
-    def calculate_hash(self):
-        block_content = json.dumps({
+    @classmethod
+    def from_dict(cls, record, BASE_DIR):
+        """Rebuilds a stored block without recomputing hashes or writing any files."""
+        block = cls.__new__(cls)
+        block.index = record["index"]
+        block.timestamp = record["timestamp"]
+        block.transactions = record["transactions"]
+        block.previous_hash = record["previous_hash"]
+        block.BASE_DIR = BASE_DIR
+        block.block_format = "json"
+        block.compression = None
+        block.block_hash = record["block_hash"]
+        block.merkle_version = record.get("merkle_version", 1)
+        block.legacy_index = record.get("legacy_index")
+        block._merkle_root = _NOT_COMPUTED  # Computed on first access (deferred verification)
+        return block
+
+    @property
+    def merkle_root(self):
+        if self._merkle_root is _NOT_COMPUTED:
+            self._merkle_root = self.compute_merkle_root()
+        return self._merkle_root
+
+    @merkle_root.setter
+    def merkle_root(self, value):
+        self._merkle_root = value
+
+    def compute_merkle_root(self):
+        if isinstance(self.transactions, dict) and "final_prices" in self.transactions:
+            tx_hashes = [transaction_hash(tx) for tx in self.transactions["final_prices"]]
+            self.merkle_tree = MerkleTree(tx_hashes, self.merkle_version)
+            return self.merkle_tree.get_merkle_root()
+        return None
+
+    def header(self):
+        """Block header: everything needed to check the block hash and Merkle proofs against it."""
+        header = {
             "index": self.index,
             "timestamp": self.timestamp,
             "merkle_root": self.merkle_root,
-            "previous_hash": self.previous_hash
-        }, sort_keys=True)
-        return hashlib.sha256(block_content.encode()).hexdigest()
+            "merkle_version": self.merkle_version,
+            "previous_hash": self.previous_hash,
+            "block_hash": self.block_hash
+        }
+        if self.legacy_index is not None:
+            header["legacy_index"] = self.legacy_index
+        return header
+
+    def merkle_proof(self, seller_index):
+        """Returns the inclusion proof of one seller's final price in this block."""
+        if getattr(self, "merkle_tree", None) is None:
+            self._merkle_root = self.compute_merkle_root()
+        return {
+            "seller_index": seller_index,
+            "transaction": self.transactions["final_prices"][seller_index],
+            "proof": self.merkle_tree.get_proof(seller_index)
+        }
+
+    def verify(self):
+        """Recomputes the Merkle root and block hash and checks them against the stored hash."""
+        self._merkle_root = self.compute_merkle_root()
+        return self.calculate_hash() == self.block_hash
+
+    def calculate_hash(self):
+        index = self.index if self.legacy_index is None else self.legacy_index
+        return block_header_hash(index, self.timestamp, self.merkle_root, self.previous_hash)
+
+    def _encode(self, record):
+        if self.block_format == "json":
+            return json.dumps(record, indent=4).encode()
+        return encode_block(record, self.block_format, self.compression)
 
     def save_block(self):
         block_dir = os.path.join(self.BASE_DIR, f"Block_{self.index}")
         os.makedirs(block_dir, exist_ok=True)
-        block_file = os.path.join(block_dir, "block_data.json")
+        extension = FILE_EXTENSIONS[self.block_format]
+        block_file = os.path.join(block_dir, f"block_data{extension}")
+
+        with open(block_file, "wb") as file:
+            file.write(self._encode(block_to_dict(self)))
 
-        with open(block_file, "w") as file:
-            json.dump({
+        if isinstance(self.transactions, dict) and "final_prices" in self.transactions:
+            # The ledger blob is written once; every node ledger entry is a hardlink (or pointer) to it
+            ledger_object = store_object(self.BASE_DIR, self._encode({
                 "index": self.index,
-                "timestamp": self.timestamp,
                 "transactions": self.transactions,
-                "previous_hash": self.previous_hash,
                 "block_hash": self.block_hash
-            }, file, indent=4)
-
-        if isinstance(self.transactions, dict) and "final_prices" in self.transactions:
+            }))
             for i in range(len(self.transactions["final_prices"])):
                 node_ledger_dir = os.path.join(self.BASE_DIR, f"Node_{i + 1}_ledger")
                 os.makedirs(node_ledger_dir, exist_ok=True)
-                node_ledger_file = os.path.join(node_ledger_dir, f"block_{self.index}_ledger.json")
-
-                with open(node_ledger_file, "w") as node_file:
-                    json.dump({
-                        "index": self.index,
-                        "transactions": self.transactions,
-                        "block_hash": self.block_hash
-                    }, node_file, indent=4)
+                node_ledger_file = os.path.join(node_ledger_dir, f"block_{self.index}_ledger{extension}")
+                link_object(self.BASE_DIR, ledger_object, node_ledger_file)
 
         print(f"✅ Block {self.index} saved successfully!")
 
+# 🔹 Serializable form of a block (as stored in the chain log and JSON exports)
+def block_to_dict(block):
+    record = {
+        "index": block.index,
+        "timestamp": block.timestamp,
+        "transactions": block.transactions,
+        "previous_hash": block.previous_hash,
+        "block_hash": block.block_hash
+    }
+    if block.merkle_version != 1:
+        record["merkle_version"] = block.merkle_version
+    if block.legacy_index is not None:
+        record["legacy_index"] = block.legacy_index
+    return record
+
+# 🔹 Light-client check of one seller's settlement: header hash + O(log n) Merkle proof
+def verify_seller_settlement(header, merkle_proof):
+    """
+    Checks that merkle_proof (from EnergyBlock.merkle_proof) proves the seller's price against the
+    header's Merkle root, and that the header hashes to its block_hash.
+    """
+    if block_header_hash(header.get("legacy_index", header["index"]), header["timestamp"], header["merkle_root"],
+                         header["previous_hash"]) != header["block_hash"]:
+        return False
+    return verify_merkle_proof(transaction_hash(merkle_proof["transaction"]), merkle_proof["proof"],
+                               header["merkle_root"], header.get("merkle_version", 1))
+
 # 🔹 Blockchain class
 class EnergyBlockchain:
-    def __init__(self, BASE_DIR):
-        self.chain = []
+    def __init__(self, BASE_DIR, sync_every=32, block_format="json", compression=None, query_index=True,
+                 window=1000, cache_size=256):
+        """
+        Chain backed by the append-only log in BASE_DIR.
+
+        Only the most recent `window` blocks are kept in self.chain; older blocks are paged in
+        from the log on access (get_block / energy_chain[index]) through an LRU cache of
+        `cache_size` blocks, so memory stays flat while the full history remains reachable.
+
+        Appends hold the chain's file lock and first pick up blocks written by other processes,
+        so several processes can clear markets against the same BASE_DIR.
+        """
+        self.chain = deque(maxlen=max(1, window))
+        self.block_cache = OrderedDict()  # index -> EnergyBlock paged in from the log
+        self.cache_size = cache_size
         self.BASE_DIR = BASE_DIR
-        self.create_genesis_block()
+        self.block_format = block_format
+        self.compression = compression
+        # Append-only on-disk chain; records of either format can be read back
+        self.store = BlockLog(BASE_DIR, sync_every=sync_every, block_format=block_format, compression=compression)
+        # SQLite sidecar for history queries (see chain_index.ChainIndex)
+        self.query_index = ChainIndex(BASE_DIR) if query_index else None
+        with self.store.lock:
+            self.store.refresh()
+            if len(self.store) == 0:
+                self.create_genesis_block()
+            else:
+                self.load_tail()
+                if self.query_index is not None:
+                    self.query_index.catch_up(self.store)
+
+    def _push(self, block):
+        if len(self.chain) == self.chain.maxlen:
+            self._cache_block(self.chain[0])  # Leaves the window; stays reachable through the LRU cache
+        self.chain.append(block)
 
     def create_genesis_block(self):
-        genesis_block = EnergyBlock(0, time.time(), {"message": "Genesis Block"}, "0", self.BASE_DIR)
-        self.chain.append(genesis_block)
+        genesis_block = EnergyBlock(0, time.time(), {"message": "Genesis Block"}, "0", self.BASE_DIR,
+                                    self.block_format, self.compression)
+        self._push(genesis_block)
+        record = block_to_dict(genesis_block)
+        self.store.append_many([record])
+        if self.query_index is not None:
+            self.query_index.add_block(record)
+
+    def _refresh(self):
+        """Loads blocks appended to the log by other processes (call with the chain lock held)."""
+        known = len(self.store)
+        added = self.store.refresh()
+        if not added:
+            return
+        if added >= self.chain.maxlen:
+            self.load_tail()
+        else:
+            for record in self.store.iter_records(known):
+                self._push(EnergyBlock.from_dict(record, self.BASE_DIR))
+        if self.query_index is not None:
+            self.query_index.catch_up(self.store)
+
+    def load_tail(self, count=None):
+        """Loads the most recent blocks from the chain log into memory (read-only, no re-hashing)."""
+        count = self.chain.maxlen if count is None else min(count, self.chain.maxlen)
+        self.chain.clear()
+        self.chain.extend(EnergyBlock.from_dict(record, self.BASE_DIR) for record in self.store.tail(count))
+
+    def __len__(self):
+        """Number of blocks in the whole chain (not just the in-memory window)."""
+        return len(self.store)
+
+    def __getitem__(self, index):
+        return self.get_block(index)
+
+    def get_block(self, index):
+        """Returns block `index` (negative counts from the tip), paging it in from the log if needed."""
+        if index < 0:
+            index += len(self.store)
+        first_in_memory = self.chain[0].index
+        if index >= first_in_memory:
+            return self.chain[index - first_in_memory]
+        if index in self.block_cache:
+            self.block_cache.move_to_end(index)
+            return self.block_cache[index]
+        block = EnergyBlock.from_dict(self.store.read(index), self.BASE_DIR)
+        self._cache_block(block)
+        return block
+
+    def _cache_block(self, block):
+        if self.cache_size <= 0:
+            return
+        self.block_cache[block.index] = block
+        self.block_cache.move_to_end(block.index)
+        while len(self.block_cache) > self.cache_size:
+            self.block_cache.popitem(last=False)
+
+    def iter_blocks(self, start=0, stop=None):
+        """Yields blocks start..stop-1 in order: older ones streamed from the log (not cached), then the window."""
+        stop = len(self.store) if stop is None else min(stop, len(self.store))
+        first_in_memory = self.chain[0].index
+        if start < first_in_memory:
+            for record in self.store.iter_records(start, min(stop, first_in_memory)):
+                yield EnergyBlock.from_dict(record, self.BASE_DIR)
+        for block in list(self.chain):
+            if max(start, first_in_memory) <= block.index < stop:
+                yield block
+
+    def verify_loaded_blocks(self):
+        """Checks hashes and previous_hash links of the in-memory blocks; returns the indices that fail."""
+        invalid = []
+        previous_block = None
+        for block in self.chain:
+            linked = previous_block is None or block.previous_hash == previous_block.block_hash
+            if not (linked and block.verify()):
+                invalid.append(block.index)
+            previous_block = block
+        return invalid
 
     def add_block(self, transactions):
-        previous_block = self.chain[-1]
-        new_block = EnergyBlock(len(self.chain), time.time(), transactions, previous_block.block_hash, self.BASE_DIR)
-        self.chain.append(new_block)
-
-        if len(self.chain) > 1000:
-            self.chain = self.chain[-1000:]
-            print("🔄 Blockchain trimmed to last 1000 blocks.")
-
-# 🔹 Save blockchain
+        """Appends one block (fsynced in batches of sync_every, or by save_blockchain) and returns it."""
+        return self._commit([transactions], sync=False)[0]
+
+    def add_blocks(self, transactions_list):
+        """Group commit: appends several blocks under one lock, with one write and one fsync."""
+        return self._commit(transactions_list, sync=True)
+
+    def _commit(self, transactions_list, sync):
+        with self.store.lock:
+            self._refresh()  # Another process may have extended the chain since our last append
+            new_blocks = []
+            for transactions in transactions_list:
+                previous_block = self.chain[-1]
+                new_block = EnergyBlock(previous_block.index + 1, time.time(), transactions, previous_block.block_hash,
+                                        self.BASE_DIR, self.block_format, self.compression)
+                self._push(new_block)
+                new_blocks.append(new_block)
+            records = [block_to_dict(block) for block in new_blocks]
+            self.store.append_many(records, sync=sync)
+            if self.query_index is not None:
+                self.query_index.add_records(records)
+        return new_blocks
+
+# 🔹 Single writer thread that group-commits blocks submitted by several producer threads
+class GroupCommitWriter:
+    def __init__(self, energy_chain, max_batch=64):
+        """
+        Producers call submit(transactions) and get a Future of the new block. Everything queued
+        while a commit is running goes into the next add_blocks() call (one write, one fsync).
+        """
+        self.energy_chain = energy_chain
+        self.max_batch = max_batch
+        self.commits = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="GroupCommitWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, transactions):
+        future = Future()
+        self._queue.put((transactions, future))
+        return future
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                blocks = self.energy_chain.add_blocks([transactions for transactions, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            self.commits += 1
+            for block, (_, future) in zip(blocks, batch):
+                future.set_result(block)
+
+    def close(self):
+        """Commits everything already submitted, then stops the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# 🔹 Save blockchain (blocks are appended to the chain log as they are added; this makes them durable)
 def save_blockchain(energy_chain, BASE_DIR):
-    blockchain_data = []
-    for block in energy_chain.chain:
-        blockchain_data.append({
-            "index": block.index,
-            "timestamp": block.timestamp,
-            "transactions": block.transactions,
-            "previous_hash": block.previous_hash,
-            "block_hash": block.block_hash
-        })
-
-    blockchain_file = os.path.join(BASE_DIR, "blockchain.json")
-    with open(blockchain_file, "w", encoding="utf-8") as file:
-        json.dump(blockchain_data, file, indent=4)
-    print("✅ Blockchain saved successfully at:", blockchain_file)
-
-# 🔹 Load blockchain
-def load_blockchain(BASE_DIR):
+    energy_chain.store.sync()
+    print("✅ Blockchain saved successfully at:", energy_chain.store.log_path)
+
+# 🔹 Export the full chain as JSON (the former blockchain.json format)
+def export_blockchain_json(energy_chain, path=None):
+    path = path or os.path.join(energy_chain.BASE_DIR, "blockchain.json")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for position, record in enumerate(energy_chain.store.iter_records()):
+            file.write(("," if position else "") + "\n" + json.dumps(record, indent=4))
+        file.write("\n]")
+    print("✅ Blockchain exported to JSON at:", path)
+    return path
+
+# 🔹 Load blockchain (reads only: blocks are deserialized without re-hashing or rewriting files)
+LEGACY_FIELDS = ("index", "timestamp", "transactions", "previous_hash", "block_hash")
+LEGACY_ARCHIVE = "blockchain_unlinked.json"  # Legacy blocks that could not be migrated
+
+def prepare_legacy_chain(blockchain_data):
+    """
+    Turns legacy blockchain.json records into chain log records.
+
+    The chain log finds blocks by position, so every record's index becomes its log position.
+    The former add_block trimmed the chain to 1000 blocks and reused len(chain) as the next
+    index, so long-running files start past 0 and repeat indices; a differing original index is
+    kept as legacy_index, since the block hash was computed over it. Only the last run of
+    well-formed, previous_hash-linked records is migrated.
+
+    Returns:
+    - records (list): Records to append to the chain log.
+    - unlinked (list): Earlier records, cut off by a broken link or a malformed record.
+    """
+    if not isinstance(blockchain_data, list):
+        raise ValueError("expected a list of blocks")
+    start = len(blockchain_data)
+    while start > 0:
+        record = blockchain_data[start - 1]
+        if not (isinstance(record, dict) and all(field in record for field in LEGACY_FIELDS)):
+            break
+        if start < len(blockchain_data) and blockchain_data[start]["previous_hash"] != record["block_hash"]:
+            break
+        start -= 1
+
+    records = []
+    for position, record in enumerate(blockchain_data[start:]):
+        original_index = record.get("legacy_index", record["index"])
+        record = dict(record, index=position)
+        record.pop("legacy_index", None)
+        if original_index != position:
+            record["legacy_index"] = original_index
+        records.append(record)
+    return records, blockchain_data[:start]
+
+def load_blockchain(BASE_DIR, verify=False, block_format="json", compression=None, window=1000, cache_size=256):
+    """
+    Opens the chain in BASE_DIR. New blocks are written with block_format ("json" or "binary")
+    and compression (None, "zlib" or "zstd"); stored blocks are read in whatever format they have.
+    window and cache_size bound the blocks held in memory (see EnergyBlockchain).
+    """
+    store = BlockLog(BASE_DIR, block_format=block_format, compression=compression)
     blockchain_file = os.path.join(BASE_DIR, "blockchain.json")
 
-    if os.path.exists(blockchain_file):
-        if os.path.getsize(blockchain_file) == 0:
-            print("⚠ Blockchain file is empty. Creating new blockchain...")
-            return EnergyBlockchain(BASE_DIR)
-
+    if len(store) == 0 and os.path.exists(blockchain_file) and os.path.getsize(blockchain_file) > 0:
+        # One-time migration of a legacy blockchain.json into the append-only chain log
         try:
             with open(blockchain_file, "r", encoding="utf-8") as file:
                 blockchain_data = json.load(file)
+            try:
+                records, unlinked = prepare_legacy_chain(blockchain_data)
+            except ValueError as error:
+                store.close()
+                raise ValueError(f"Cannot migrate {blockchain_file}: {error}. Move the file away to start "
+                                 "a new chain; nothing was migrated.") from None
+            if unlinked:
+                archive_file = os.path.join(BASE_DIR, LEGACY_ARCHIVE)
+                with open(archive_file, "w", encoding="utf-8") as file:
+                    json.dump(unlinked, file, indent=4)
+                print(f"⚠ {len(unlinked)} legacy block(s) before a broken previous_hash link were not migrated "
+                      f"(archived in {archive_file}).")
+            with store.lock:
+                if store.refresh() == 0:
+                    store.append_many(records)
+            print(f"🔄 Migrated {len(records)} blocks from blockchain.json to the chain log.")
+            renumbered = sum("legacy_index" in record for record in records)
+            if renumbered:
+                print(f"🔢 {renumbered} block(s) renumbered to their chain position (original index kept as legacy_index).")
         except json.JSONDecodeError:
             print("⚠ Blockchain file corrupted. Creating new blockchain...")
-            return EnergyBlockchain(BASE_DIR)
-
-        energy_chain = EnergyBlockchain(BASE_DIR)
-        energy_chain.chain = []
-        for block in blockchain_data:
-            restored_block = EnergyBlock(
-                block["index"],
-                block["timestamp"],
-                block["transactions"],
-                block["previous_hash"],
-                BASE_DIR
-            )
-            restored_block.block_hash = block["block_hash"]
-            energy_chain.chain.append(restored_block)
-
-        print("🔄 Blockchain loaded successfully!")
-        return energy_chain
-    else:
+    store.close()
+
+    if len(store) == 0:
         print("⚠ No previous blockchain found. Creating a new one...")
-        return EnergyBlockchain(BASE_DIR)
+        return EnergyBlockchain(BASE_DIR, block_format=block_format, compression=compression,
+                                window=window, cache_size=cache_size)
+
+    energy_chain = EnergyBlockchain(BASE_DIR, block_format=block_format, compression=compression,
+                                window=window, cache_size=cache_size)
+    if verify:
+        invalid = energy_chain.verify_loaded_blocks()
+        if invalid:
+            print(f"⚠ Blockchain verification failed for block(s): {invalid}")
+    print("🔄 Blockchain loaded successfully!")
+    return energy_chain
@@ -0,0 +1,159 @@
+import os
+import sqlite3
+
+import numpy as np
+
+INDEX_DB = "chain_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    block_index INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    num_sellers INTEGER NOT NULL,
+    iterations INTEGER,
+    total_payment_with_reward REAL
+);
+CREATE INDEX IF NOT EXISTS blocks_by_time ON blocks (timestamp);
+CREATE TABLE IF NOT EXISTS seller_series (
+    seller INTEGER NOT NULL,
+    block_index INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    price REAL,
+    buyer_share REAL,
+    reward REAL,
+    PRIMARY KEY (seller, block_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seller_series_by_time ON seller_series (seller, timestamp);
+"""
+
+SERIES_COLUMNS = ("block_index", "timestamp", "price", "buyer_share", "reward")
+
+
+def _time_filter(start_time, end_time, column="timestamp"):
+    """SQL condition and parameters for an optional [start_time, end_time] range (epoch seconds)."""
+    conditions, parameters = [], []
+    if start_time is not None:
+        conditions.append(f"{column} >= ?")
+        parameters.append(start_time)
+    if end_time is not None:
+        conditions.append(f"{column} <= ?")
+        parameters.append(end_time)
+    return (" AND " + " AND ".join(conditions)) if conditions else "", parameters
+
+
+# 🔹 SQLite sidecar index of the chain log for range and aggregate queries
+class ChainIndex:
+    def __init__(self, BASE_DIR):
+        """
+        Query index kept next to the chain log (chain_index.sqlite).
+
+        Holds block index -> timestamp, per-seller price / buyer share / reward series and
+        per-block totals. The chain log stays the source of truth: the index is written without
+        fsync and catch_up() re-indexes whatever blocks it is missing.
+        Sellers are numbered from 1, as in the reports ("Seller 1", "Node_1_ledger").
+        """
+        self.path = os.path.join(BASE_DIR, INDEX_DB)
+        # Writes happen under the chain lock, possibly from a GroupCommitWriter thread
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.executescript(SCHEMA)
+
+    def height(self):
+        """Index of the last indexed block (-1 when empty)."""
+        (height,) = self.connection.execute("SELECT MAX(block_index) FROM blocks").fetchone()
+        return -1 if height is None else height
+
+    def add_records(self, records):
+        """Indexes block records (as stored in the chain log) in one transaction."""
+        block_rows, seller_rows = [], []
+        for record in records:
+            transactions = record["transactions"]
+            prices = transactions.get("final_prices", []) if isinstance(transactions, dict) else []
+            block_rows.append((record["index"], record["timestamp"], len(prices),
+                               transactions.get("iterations") if prices else None,
+                               transactions.get("total_payment_with_reward") if prices else None))
+            shares = transactions.get("buyer_shares", []) if prices else []
+            rewards = transactions.get("rewards", []) if prices else []
+            for i, price in enumerate(prices):
+                seller_rows.append((i + 1, record["index"], record["timestamp"], price,
+                                    shares[i] if i < len(shares) else None,
+                                    rewards[i] if i < len(rewards) else None))
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?)", block_rows)
+            self.connection.executemany("INSERT OR REPLACE INTO seller_series VALUES (?, ?, ?, ?, ?, ?)", seller_rows)
+        return len(block_rows)
+
+    def add_block(self, record):
+        self.add_records([record])
+
+    def catch_up(self, store, batch_size=5000):
+        """Indexes the blocks of the chain log (a BlockLog) that are not indexed yet; returns how many."""
+        start = self.height() + 1
+        if start > len(store):
+            # The log was truncated (crash recovery): drop index rows of blocks it no longer holds
+            with self.connection:
+                self.connection.execute("DELETE FROM blocks WHERE block_index >= ?", (len(store),))
+                self.connection.execute("DELETE FROM seller_series WHERE block_index >= ?", (len(store),))
+            start = len(store)
+        added = 0
+        for batch_start in range(start, len(store), batch_size):
+            added += self.add_records(store.iter_records(batch_start, batch_start + batch_size))
+        if added:
+            print(f"🗂 Chain index updated with {added} block(s).")
+        return added
+
+    # 🔹 Queries (times are epoch seconds, both ends inclusive and optional)
+    def block_timestamps(self, start_time=None, end_time=None):
+        """Returns (block indices, timestamps) as arrays."""
+        condition, parameters = _time_filter(start_time, end_time)
+        rows = self.connection.execute(
+            f"SELECT block_index, timestamp FROM blocks WHERE 1 = 1{condition} ORDER BY block_index",
+            parameters).fetchall()
+        indices = np.array([row[0] for row in rows], dtype=np.int64)
+        timestamps = np.array([row[1] for row in rows], dtype=float)
+        return indices, timestamps
+
+    def blocks_between(self, start_time=None, end_time=None):
+        """Returns the (first, last) block index in a time range, or None if it holds no blocks."""
+        condition, parameters = _time_filter(start_time, end_time)
+        first, last = self.connection.execute(
+            f"SELECT MIN(block_index), MAX(block_index) FROM blocks WHERE 1 = 1{condition}", parameters).fetchone()
+        return None if first is None else (first, last)
+
+    def seller_series(self, seller, start_time=None, end_time=None):
+        """Returns a seller's price / buyer share / reward time series as a dict of arrays (see SERIES_COLUMNS)."""
+        condition, parameters = _time_filter(start_time, end_time)
+        rows = self.connection.execute(
+            f"SELECT {', '.join(SERIES_COLUMNS)} FROM seller_series WHERE seller = ?{condition} ORDER BY block_index",
+            [seller] + parameters).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * len(SERIES_COLUMNS)
+        return {name: np.array(values, dtype=np.int64 if name == "block_index" else float)
+                for name, values in zip(SERIES_COLUMNS, columns)}
+
+    def seller_totals(self, seller, start_time=None, end_time=None):
+        """Returns a seller's block count, total reward, average price and total buyer share in a time range."""
+        condition, parameters = _time_filter(start_time, end_time)
+        blocks, reward, mean_price, buyer_share = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(reward), 0), AVG(price), COALESCE(SUM(buyer_share), 0) "
+            f"FROM seller_series WHERE seller = ?{condition}", [seller] + parameters).fetchone()
+        return {"seller": seller, "blocks": blocks, "total_reward": reward,
+                "mean_price": mean_price, "total_buyer_share": buyer_share}
+
+    def top_sellers(self, limit=10, start_time=None, end_time=None):
+        """Returns [(seller, total reward)] of the highest-earning sellers in a time range."""
+        condition, parameters = _time_filter(start_time, end_time)
+        return self.connection.execute(
+            f"SELECT seller, SUM(reward) AS total FROM seller_series WHERE 1 = 1{condition} "
+            "GROUP BY seller ORDER BY total DESC LIMIT ?", parameters + [limit]).fetchall()
+
+    def payment_totals(self, start_time=None, end_time=None):
+        """Returns the number of market blocks and the sum of total_payment_with_reward in a time range."""
+        condition, parameters = _time_filter(start_time, end_time)
+        blocks, total = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(total_payment_with_reward), 0) FROM blocks "
+            f"WHERE num_sellers > 0{condition}", parameters).fetchone()
+        return {"blocks": blocks, "total_payment_with_reward": total}
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .block_codec import encode_block, decode_block
+
+LOG_FILE = "blockchain.log"
+INDEX_FILE = "blockchain.idx"
+LOCK_FILE = "blockchain.lock"
+OBJECTS_DIR = "objects"
+
+RECORD_HEADER = struct.Struct(">I")  # Length prefix of every record in the log
+INDEX_ENTRY = struct.Struct(">Q")  # Byte offset of block i, stored at position i * INDEX_ENTRY.size
+
+
+# 🔹 Record encoding (compact JSON or binary; the format of each record is detected on read)
+def encode_record(record, block_format="json", compression=None):
+    return encode_block(record, block_format, compression)
+
+
+def decode_record(payload):
+    return decode_block(payload)
+
+
+# 🔹 Advisory lock shared by every process writing to the same chain
+class ChainLock:
+    def __init__(self, BASE_DIR):
+        """
+        Re-entrant exclusive lock on blockchain.lock (fcntl.flock, or msvcrt.locking on Windows).
+        It also serializes threads of this process that share the same lock object.
+        """
+        self.path = os.path.join(BASE_DIR, LOCK_FILE)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            self._file = open(self.path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK gives up after ~10 seconds; keep waiting
+                        continue
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+# 🔹 Append-only segment log of block records
+class BlockLog:
+    def __init__(self, BASE_DIR, sync_every=32, read_only=False, block_format="json", compression=None):
+        """
+        Append-only block storage: length-prefixed records in blockchain.log plus a fixed-width
+        index (blockchain.idx) mapping block position to byte offset.
+
+        Appends cost O(1) on disk; records are fsynced in batches of sync_every (and on sync()).
+        A partially written tail left by a crash is truncated when the log is opened.
+        With read_only=True the log is only read (no recovery, no append handles), which is
+        how worker processes open it.
+        New records are encoded with block_format ("json" or "binary") and compression
+        (None, "zlib" or "zstd"); existing records are read back whatever their format.
+        Writers hold self.lock (a ChainLock) around refresh() + append so several processes
+        can share one log.
+        """
+        self.BASE_DIR = BASE_DIR
+        self.block_format = block_format
+        self.compression = compression
+        self.log_path = os.path.join(BASE_DIR, LOG_FILE)
+        self.index_path = os.path.join(BASE_DIR, INDEX_FILE)
+        self.sync_every = max(1, sync_every)
+        self._pending = 0
+        self.read_only = read_only
+        if read_only:
+            self.lock = None
+            self._log = self._index = None
+        else:
+            os.makedirs(BASE_DIR, exist_ok=True)
+            self.lock = ChainLock(BASE_DIR)
+            with self.lock:  # Another writer's append in progress must not look like a torn tail
+                self._recover()
+            self._log = open(self.log_path, "ab")
+            self._index = open(self.index_path, "ab")
+        self._count = os.path.getsize(self.index_path) // INDEX_ENTRY.size if os.path.exists(self.index_path) else 0
+
+    def _recover(self):
+        """Drops index entries and log bytes that belong to an incompletely written record."""
+        for path in (self.log_path, self.index_path):
+            if not os.path.exists(path):
+                open(path, "wb").close()
+
+        log_size = os.path.getsize(self.log_path)
+        index_size = os.path.getsize(self.index_path)
+        count = index_size // INDEX_ENTRY.size
+        valid_end = 0
+        with open(self.index_path, "rb") as index, open(self.log_path, "rb") as log:
+            while count > 0:
+                index.seek((count - 1) * INDEX_ENTRY.size)
+                (offset,) = INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))
+                log.seek(offset)
+                header = log.read(RECORD_HEADER.size)
+                if len(header) == RECORD_HEADER.size:
+                    (length,) = RECORD_HEADER.unpack(header)
+                    if offset + RECORD_HEADER.size + length <= log_size:
+                        valid_end = offset + RECORD_HEADER.size + length
+                        break
+                count -= 1
+
+        if index_size != count * INDEX_ENTRY.size or log_size != valid_end:
+            print("⚠ Incomplete block record found in the chain log. Truncating to the last complete block.")
+            with open(self.index_path, "r+b") as index:
+                index.truncate(count * INDEX_ENTRY.size)
+            with open(self.log_path, "r+b") as log:
+                log.truncate(valid_end)
+
+    def __len__(self):
+        return self._count
+
+    def refresh(self):
+        """Picks up records appended by other processes; returns how many there were."""
+        count = os.path.getsize(self.index_path) // INDEX_ENTRY.size
+        added = count - self._count
+        self._count = count
+        return added
+
+    def append(self, record):
+        """Appends one block record and returns its position in the log."""
+        return self.append_many([record], sync=False)
+
+    def append_many(self, records, sync=True):
+        """
+        Group commit: appends several records with one write to the log and one to the index,
+        then (with sync=True) one fsync. Returns the position of the last record.
+        """
+        offset = self._log.seek(0, os.SEEK_END)
+        log_chunks, index_chunks = [], []
+        for record in records:
+            payload = encode_record(record, self.block_format, self.compression)
+            log_chunks.append(RECORD_HEADER.pack(len(payload)) + payload)
+            index_chunks.append(INDEX_ENTRY.pack(offset))
+            offset += RECORD_HEADER.size + len(payload)
+        self._log.write(b"".join(log_chunks))
+        self._log.flush()
+        self._index.write(b"".join(index_chunks))
+        self._index.flush()
+        self._count += len(records)
+        self._pending += len(records)
+        if sync or self._pending >= self.sync_every:
+            self.sync()
+        return self._count - 1
+
+    def sync(self):
+        """Forces all appended records to disk."""
+        if self._pending:
+            os.fsync(self._log.fileno())
+            os.fsync(self._index.fileno())
+            self._pending = 0
+
+    def read(self, position):
+        """Reads the record at the given position (0 = genesis)."""
+        if not 0 <= position < self._count:
+            raise IndexError(f"Block position {position} out of range (log holds {self._count} blocks).")
+        with open(self.index_path, "rb") as index:
+            index.seek(position * INDEX_ENTRY.size)
+            (offset,) = INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))
+        with open(self.log_path, "rb") as log:
+            log.seek(offset)
+            (length,) = RECORD_HEADER.unpack(log.read(RECORD_HEADER.size))
+            return decode_record(log.read(length))
+
+    def iter_records(self, start=0, stop=None):
+        """Yields records from position start up to (not including) stop, in order."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        with open(self.index_path, "rb") as index:
+            index.seek(start * INDEX_ENTRY.size)
+            (offset,) = INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))
+        with open(self.log_path, "rb") as log:
+            log.seek(offset)
+            for _ in range(start, stop):
+                (length,) = RECORD_HEADER.unpack(log.read(RECORD_HEADER.size))
+                yield decode_record(log.read(length))
+
+    def tail(self, count):
+        """Returns the last count records without reading the rest of the log."""
+        return list(self.iter_records(max(0, self._count - count)))
+
+    def close(self):
+        if self.read_only:
+            return
+        self.sync()
+        self._log.close()
+        self._index.close()
+
+
+# 🔹 Content-addressed object store for ledger blobs shared by many nodes
+def store_object(BASE_DIR, payload):
+    """Writes payload once under objects/<sha256[:2]>/<sha256> and returns its path (existing objects are reused)."""
+    digest = hashlib.sha256(payload).hexdigest()
+    object_dir = os.path.join(BASE_DIR, OBJECTS_DIR, digest[:2])
+    object_path = os.path.join(object_dir, digest)
+    if not os.path.exists(object_path):
+        os.makedirs(object_dir, exist_ok=True)
+        temp_path = f"{object_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(payload)
+        os.replace(temp_path, object_path)
+    return object_path
+
+
+def link_object(BASE_DIR, object_path, target_path):
+    """
+    Makes target_path refer to a stored object: a hardlink when the filesystem supports it,
+    otherwise a small pointer file {"object": <path relative to BASE_DIR>}.
+    """
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    try:
+        os.link(object_path, temp_path)
+    except OSError:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"object": os.path.relpath(object_path, BASE_DIR)}, file)
+    os.replace(temp_path, target_path)
+
+
+def read_ledger_file(BASE_DIR, path):
+    """Reads a node ledger file (JSON or binary), following a pointer file to its object if needed."""
+    with open(path, "rb") as file:
+        data = decode_block(file.read())
+    if isinstance(data, dict) and set(data) == {"object"}:
+        with open(os.path.join(BASE_DIR, data["object"]), "rb") as file:
+            data = decode_block(file.read())
+    return data
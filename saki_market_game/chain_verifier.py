@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .blockchain_engine import EnergyBlock
+from .chain_store import BlockLog
+
+CHECKPOINT_FILE = "verify_checkpoint.json"
+
+
+# 🔹 Worker: recompute Merkle roots and block hashes for one chunk of the log
+def _verify_chunk(task):
+    BASE_DIR, start, stop = task
+    store = BlockLog(BASE_DIR, read_only=True)
+    invalid_hashes = []
+    broken_links = []
+    first_previous_hash = last_block_hash = None
+    for position, record in enumerate(store.iter_records(start, stop), start=start):
+        block = EnergyBlock.from_dict(record, BASE_DIR)
+        if not block.verify():
+            invalid_hashes.append(position)
+        if first_previous_hash is None:
+            first_previous_hash = block.previous_hash
+        elif block.previous_hash != last_block_hash:
+            broken_links.append(position)
+        last_block_hash = block.block_hash
+    return start, invalid_hashes, broken_links, first_previous_hash, last_block_hash
+
+
+def _load_checkpoint(BASE_DIR, store):
+    """Returns (height, block_hash) of the last verified block, or (-1, None) when starting over."""
+    path = os.path.join(BASE_DIR, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return -1, None
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+        height, block_hash = checkpoint["height"], checkpoint["block_hash"]
+    except (json.JSONDecodeError, KeyError):
+        return -1, None
+    # The checkpoint only counts if the block it points to is still the same block
+    if 0 <= height < len(store) and store.read(height)["block_hash"] == block_hash:
+        return height, block_hash
+    print("⚠ Verification checkpoint no longer matches the chain. Verifying from genesis.")
+    return -1, None
+
+
+def _save_checkpoint(BASE_DIR, height, block_hash):
+    path = os.path.join(BASE_DIR, CHECKPOINT_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump({"height": height, "block_hash": block_hash, "verified_at": time.time()}, file)
+    os.replace(path + ".tmp", path)
+
+
+# 🔹 Parallel, incremental chain verification
+def verify_chain(BASE_DIR, processes=None, chunk_size=2000, full=False):
+    """
+    Verifies block hashes, Merkle roots and previous_hash links of the chain log in BASE_DIR.
+
+    Hashes are recomputed across a process pool in chunks; links are then checked in a final
+    linear pass over the chunk boundaries. The height of the last verified block is saved in
+    verify_checkpoint.json so later runs only verify new blocks (full=True starts from genesis).
+
+    Returns:
+    - report (dict): start_height, height, verified, invalid_hashes, broken_links, ok,
+      seconds and blocks_per_second.
+    """
+    start_time = time.perf_counter()
+    store = BlockLog(BASE_DIR, read_only=True)
+    height, last_hash = (-1, None) if full else _load_checkpoint(BASE_DIR, store)
+    start = height + 1
+    tasks = [(BASE_DIR, chunk_start, min(chunk_start + chunk_size, len(store)))
+             for chunk_start in range(start, len(store), chunk_size)]
+
+    if processes == 1 or len(tasks) <= 1:
+        results = list(map(_verify_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_verify_chunk, tasks))
+
+    # Final linear pass: stitch chunk boundaries together and find the first failure
+    invalid_hashes, broken_links = [], []
+    previous_block_hash = last_hash
+    for chunk_start, chunk_invalid, chunk_broken, first_previous_hash, chunk_last_hash in results:
+        if chunk_start > 0 and first_previous_hash != previous_block_hash:
+            broken_links.append(chunk_start)
+        invalid_hashes.extend(chunk_invalid)
+        broken_links.extend(chunk_broken)
+        previous_block_hash = chunk_last_hash
+
+    failures = sorted(invalid_hashes + broken_links)
+    verified_height = (failures[0] - 1) if failures else len(store) - 1
+    if verified_height > height:
+        _save_checkpoint(BASE_DIR, verified_height, store.read(verified_height)["block_hash"])
+
+    seconds = time.perf_counter() - start_time
+    verified = len(store) - start
+    report = {
+        "start_height": start,
+        "height": verified_height,
+        "verified": verified,
+        "invalid_hashes": invalid_hashes,
+        "broken_links": sorted(broken_links),
+        "ok": not failures,
+        "seconds": seconds,
+        "blocks_per_second": verified / seconds if seconds > 0 else float("inf"),
+    }
+
+    if failures:
+        print(f"🚨 Chain verification failed: {len(invalid_hashes)} invalid hash(es), "
+              f"{len(report['broken_links'])} broken link(s). First failure at block {failures[0]}.")
+    else:
+        print(f"✅ Chain verified up to block {verified_height}: {verified} new block(s) in {seconds:.2f}s "
+              f"({report['blocks_per_second']:.0f} blocks/s).")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the Tartchain block log")
+    parser.add_argument("base_dir", help="Tartchain folder")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--full", action="store_true", help="Ignore the checkpoint and verify from genesis")
+    args = parser.parse_args()
+    result = verify_chain(args.base_dir, processes=args.processes, chunk_size=args.chunk_size, full=args.full)
+    raise SystemExit(0 if result["ok"] else 1)
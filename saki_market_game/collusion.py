@@ -0,0 +1,163 @@
+import numpy as np
+
+from .market_history import MarketHistory
+from .saki_batch import stack_markets
+
+
+def _collusion_verdict(early_stop_flag, price_stability_flag, equal_share_flag):
+    """Two or more warning signs confirm collusion."""
+    collusion_detected = sum([early_stop_flag, price_stability_flag, equal_share_flag]) >= 2
+
+    if collusion_detected:
+        print("\n🚨 Collusion Confirmed! Market will be restarted with a new moderator seller.")
+
+    return collusion_detected
+
+
+# 🔹 Collusion detection
+def detect_collusion(num_sellers, final_prices, buyer_shares, price_history, iterations, price_stability_threshold=0.01, min_iterations=10):
+    """Detects potential collusion among sellers (price_history may be a 2-D array or a MarketHistory)."""
+    early_stop_flag = iterations < min_iterations
+    if early_stop_flag:
+        print(f"\n⚠ Warning: Market stabilized in only {iterations} iterations. Possible collusion detected!")
+
+    if len(price_history) < 2:
+        print("\n⚠ Not enough price history for collusion detection.")
+        return early_stop_flag
+
+    if isinstance(price_history, MarketHistory):
+        avg_price_change = price_history.mean_abs_price_change()  # Running statistic, no materialized history
+    else:
+        price_history = np.asarray(price_history)
+        avg_price_change = np.mean(np.abs(price_history[1:] - price_history[:-1]), axis=0)
+    price_stability_flag = np.all(avg_price_change < price_stability_threshold)
+
+    if price_stability_flag:
+        print("\n⚠ Warning: Prices remained almost unchanged during the game. Possible collusion detected!")
+
+    market_share_variance = np.std(buyer_shares)
+    equal_share_flag = market_share_variance < 0.05
+
+    if equal_share_flag:
+        print("\n⚠ Warning: Market shares among sellers are nearly identical. Possible collusion detected!")
+
+    return _collusion_verdict(early_stop_flag, price_stability_flag, equal_share_flag)
+
+
+# 🔹 Online collusion detection inside the saki() loop
+class CollusionMonitor:
+    def __init__(self, num_sellers, price_stability_threshold=0.01, min_iterations=10, share_std_threshold=0.05):
+        """
+        Streaming counterpart of detect_collusion, fed by saki(collusion_monitor=...).
+
+        It keeps the running mean absolute price change and the current share spread. Once
+        min_iterations have passed, a market whose prices have stayed almost unchanged and whose
+        shares are nearly identical (two warning signs) is flagged, and saki() stops right away
+        instead of running on to convergence or max_iterations. finish() then gives the same
+        verdict as detect_collusion on the full history.
+        """
+        self.num_sellers = num_sellers
+        self.price_stability_threshold = price_stability_threshold
+        self.min_iterations = min_iterations
+        self.share_std_threshold = share_std_threshold
+        self._abs_change_sum = np.zeros(num_sellers)
+        self.steps = 0
+        self.detected_at = None  # Iteration at which collusion was flagged inside the loop
+
+    def _price_stability(self):
+        return self.steps > 0 and bool(np.all(self._abs_change_sum / self.steps < self.price_stability_threshold))
+
+    def update(self, prev_prices, prices, buyer_shares, iteration):
+        """Records one saki() iteration; returns True when the market should stop as collusive."""
+        self._abs_change_sum += np.abs(np.asarray(prices, dtype=float) - np.asarray(prev_prices, dtype=float))
+        self.steps += 1
+        if (iteration >= self.min_iterations and self._price_stability()
+                and np.std(buyer_shares) < self.share_std_threshold):
+            self.detected_at = iteration
+            print(f"\n🚨 Collusion pattern detected at iteration {iteration}. Stopping the market early.")
+            return True
+        return False
+
+    def finish(self, iterations, buyer_shares):
+        """Final verdict with the warnings of detect_collusion, from the running statistics."""
+        early_stop_flag = iterations < self.min_iterations
+        if early_stop_flag:
+            print(f"\n⚠ Warning: Market stabilized in only {iterations} iterations. Possible collusion detected!")
+
+        if self.steps == 0:
+            print("\n⚠ Not enough price history for collusion detection.")
+            return early_stop_flag
+
+        price_stability_flag = self._price_stability()
+        if price_stability_flag:
+            print("\n⚠ Warning: Prices remained almost unchanged during the game. Possible collusion detected!")
+
+        equal_share_flag = np.std(buyer_shares) < self.share_std_threshold
+        if equal_share_flag:
+            print("\n⚠ Warning: Market shares among sellers are nearly identical. Possible collusion detected!")
+
+        return _collusion_verdict(early_stop_flag, price_stability_flag, equal_share_flag)
+
+
+# 🔹 Vectorized scan of chain history for repeated collusion patterns
+def scan_chain_collusion(blocks, min_iterations=10, share_std_threshold=0.05, price_spread_threshold=0.01):
+    """
+    Flags suspicious markets across many blocks at once.
+
+    Parameters:
+    - blocks (iterable): EnergyBlock objects, e.g. energy_chain.iter_blocks(start, stop).
+      Blocks without market transactions (genesis) are skipped.
+    - min_iterations (int): Markets settling in fewer iterations are flagged as early stops.
+    - share_std_threshold (float): Markets whose buyer shares have a lower spread are flagged.
+    - price_spread_threshold (float): Markets whose relative price spread (std / mean) is
+      lower are flagged as uniform pricing.
+
+    Returns:
+    - scan (dict of ndarrays): Per block "block_index", "early_stop", "equal_shares",
+      "uniform_prices" and "suspicious" (two or more flags); per seller position
+      "seller_suspicious_rate" (share of that seller's markets that were suspicious); and
+      "longest_suspicious_run" (most consecutive suspicious blocks).
+    """
+    indices, prices, shares, iterations = [], [], [], []
+    for block in blocks:
+        transactions = block.transactions
+        if isinstance(transactions, dict) and transactions.get("final_prices"):
+            indices.append(block.index)
+            prices.append(transactions["final_prices"])
+            shares.append(transactions["buyer_shares"])
+            iterations.append(transactions.get("iterations", min_iterations))
+
+    price_matrix, seller_mask = stack_markets(prices)
+    share_matrix, _ = stack_markets(shares)
+    counts = np.maximum(seller_mask.sum(axis=1), 1)
+
+    def masked_std(values):
+        mean = values.sum(axis=1) / counts
+        centered = np.where(seller_mask, values - mean[:, None], 0.0)
+        return mean, np.sqrt((centered ** 2).sum(axis=1) / counts)
+
+    price_mean, price_std = masked_std(price_matrix)
+    _, share_std = masked_std(share_matrix)
+
+    early_stop = np.asarray(iterations, dtype=float) < min_iterations
+    equal_shares = share_std < share_std_threshold
+    uniform_prices = price_std < price_spread_threshold * np.abs(price_mean)
+    suspicious = (early_stop.astype(int) + equal_shares + uniform_prices) >= 2
+
+    participations = seller_mask.sum(axis=0)
+    seller_suspicious_rate = (seller_mask & suspicious[:, None]).sum(axis=0) / np.maximum(participations, 1)
+
+    # Longest run of consecutive suspicious blocks
+    padded = np.concatenate(([0], suspicious.astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    longest_run = int((edges[1::2] - edges[::2]).max()) if len(edges) else 0
+
+    return {
+        "block_index": np.asarray(indices, dtype=np.int64),
+        "early_stop": early_stop,
+        "equal_shares": equal_shares,
+        "uniform_prices": uniform_prices,
+        "suspicious": suspicious,
+        "seller_suspicious_rate": seller_suspicious_rate,
+        "longest_suspicious_run": longest_run,
+    }
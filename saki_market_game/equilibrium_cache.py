@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .saki_core import saki
+
+# saki() arguments that describe the market itself (used for warm-start neighbour search)
+SELLER_PARAMETERS = ("capacities", "qualities", "production_costs", "min_profits")
+MARKET_PARAMETERS = ("buyer_demand", "max_profit_percentage", "max_change_percentage")
+# saki() arguments that observe a run instead of defining the market: never part of the key,
+# and a call that sets one always runs saki() (a cached result would leave them unfilled)
+RUN_OBSERVERS = ("history", "collusion_monitor")
+
+
+# 🔹 Canonical key of a saki() call
+def market_cache_key(market):
+    """
+    Returns a SHA-256 key of the saki() keyword arguments (order-independent, floats canonicalized).
+    RUN_OBSERVERS arguments are left out.
+    """
+    canonical = {}
+    for name, value in market.items():
+        if name in RUN_OBSERVERS:
+            continue
+        if isinstance(value, (list, tuple, np.ndarray)):
+            value = [float(v) for v in value]
+        elif isinstance(value, (float, np.floating)):
+            value = float(value)
+        canonical[name] = value
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+def _parameter_vector(market):
+    parts = [np.asarray(market[name], dtype=float) for name in SELLER_PARAMETERS]
+    parts.append(np.array([market[name] for name in MARKET_PARAMETERS], dtype=float))
+    return np.concatenate(parts)
+
+
+def _copy_result(result):
+    final_prices, buyer_shares, price_history, share_history, iterations = result
+    return list(final_prices), np.array(buyer_shares), np.array(price_history), np.array(share_history), iterations
+
+
+# 🔹 Memoized saki() with optional disk store and warm starts
+class EquilibriumCache:
+    def __init__(self, max_entries=128, directory=None, warm_start=False, warm_start_tolerance=0.05):
+        """
+        Memoization layer around saki().
+
+        Parameters:
+        - max_entries (int): Size of the in-memory LRU.
+        - directory (str, optional): Folder for the on-disk store (one .npz file per key).
+        - warm_start (bool): On a miss, start from the cached equilibrium prices of the closest
+          market with the same seller count whose parameters all lie within warm_start_tolerance
+          (relative), instead of the given initial prices.
+        - warm_start_tolerance (float): Maximum relative parameter difference for a warm start.
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.warm_start = warm_start
+        self.warm_start_tolerance = warm_start_tolerance
+        self._entries = OrderedDict()  # key -> (parameter vector, result)
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        self.clearings = 0
+        self.iterations_run = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def average_iterations(self):
+        """Average number of saki() iterations actually run per clearing (hits count as zero)."""
+        return self.iterations_run / max(self.clearings, 1)
+
+    def solve(self, **market):
+        """
+        Returns saki(**market), from the cache when the same market has been cleared before.
+        Calls passing a history or collusion_monitor bypass the cache and run saki() directly.
+        """
+        self.clearings += 1
+        if any(market.get(name) is not None for name in RUN_OBSERVERS):
+            result = saki(**market)
+            self.iterations_run += result[4]
+            return result
+
+        key = market_cache_key(market)
+
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+            print("♻ Equilibrium cache hit.")
+            return _copy_result(result)
+
+        self.misses += 1
+        run_market = dict(market)
+        parameters = _parameter_vector(market)
+        if self.warm_start:
+            neighbour_prices = self._nearest_prices(parameters)
+            if neighbour_prices is not None:
+                production_costs = np.asarray(market["production_costs"], dtype=float)
+                price_cap = production_costs * (1 + market["max_profit_percentage"])
+                run_market["initial_prices"] = np.clip(neighbour_prices, production_costs, price_cap).tolist()
+                self.warm_starts += 1
+                print("🔥 Warm start from a cached equilibrium.")
+
+        result = saki(**run_market)
+        self.iterations_run += result[4]
+        self._store(key, parameters, result)
+        return _copy_result(result)
+
+    def _lookup(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+        if self.directory is None:
+            return None
+        path = os.path.join(self.directory, f"{key}.npz")
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            parameters = data["parameters"]
+            result = (data["final_prices"].tolist(), data["buyer_shares"], data["price_history"],
+                      data["share_history"], int(data["iterations"]))
+        self._remember(key, parameters, result)
+        return result
+
+    def _store(self, key, parameters, result):
+        self._remember(key, parameters, result)
+        if self.directory is not None:
+            final_prices, buyer_shares, price_history, share_history, iterations = result
+            np.savez_compressed(
+                os.path.join(self.directory, f"{key}.npz"), parameters=parameters,
+                final_prices=np.asarray(final_prices, dtype=float), buyer_shares=np.asarray(buyer_shares),
+                price_history=np.asarray(price_history), share_history=np.asarray(share_history),
+                iterations=iterations)
+
+    def _remember(self, key, parameters, result):
+        self._entries[key] = (parameters, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _nearest_prices(self, parameters):
+        best_prices, best_distance = None, None
+        for cached_parameters, result in self._entries.values():
+            if cached_parameters.shape != parameters.shape:
+                continue
+            scale = np.maximum(np.maximum(np.abs(parameters), np.abs(cached_parameters)), 1e-12)
+            distance = float(np.max(np.abs(cached_parameters - parameters) / scale))
+            if distance <= self.warm_start_tolerance and (best_distance is None or distance < best_distance):
+                best_prices, best_distance = result[0], distance
+        return best_prices
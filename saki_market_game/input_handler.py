@@ -1,3 +1,139 @@
+# 🔹 Validation rules shared by the interactive prompts and batch market specs
+# Each check returns an error message, or None when the value is valid.
+def check_buyer_demand(buyer_demand):
+    if buyer_demand <= 0:
+        return "Demand must be a positive number."
+    return None
+
+def check_supply_coefficient(supply_coefficient):
+    if not 0.2 <= supply_coefficient <= 1:
+        return "Supply coefficient must be between 0.2 and 1."
+    return None
+
+def minimum_capacity(buyer_demand, supply_coefficient, num_sellers):
+    """Minimum capacity each seller needs so that the suppliers can meet the demand."""
+    return buyer_demand / (supply_coefficient * num_sellers)
+
+def check_vector(values, num_sellers, min_value=None, max_value=None):
+    if len(values) != num_sellers:
+        return f"You must enter exactly {num_sellers} values separated by commas."
+    if min_value is not None and any(v < min_value for v in values):
+        return f"Each value must be at least {min_value:.2f}."
+    if max_value is not None and any(v > max_value for v in values):
+        return f"Each value must not exceed {max_value:.2f}."
+    return None
+
+def check_max_profit_percentage(max_profit_percentage):
+    if not 0 <= max_profit_percentage <= 1:
+        return "Profit percentage must be between 0 and 1 (0% - 100%)."
+    return None
+
+def min_profit_bounds(capacity, production_cost, max_profit_percentage):
+    """Allowed (lower, upper) range of a seller's minimum required total profit."""
+    return 0, capacity * (production_cost * max_profit_percentage)
+
+def check_min_profit(min_profit, lower_bound, upper_bound):
+    if not lower_bound <= min_profit <= upper_bound:
+        return f"Minimum profit must be between {lower_bound:.2f} and {upper_bound:.2f}."
+    return None
+
+def check_max_change_percentage(max_change_percentage):
+    if not 0 <= max_change_percentage <= 1:
+        return "Max change percentage must be between 0 and 1."
+    return None
+
+def check_initial_price(price, production_cost, max_profit_percentage):
+    valid_range_low = production_cost
+    valid_range_high = production_cost * (1 + max_profit_percentage)
+    if not valid_range_low <= price <= valid_range_high:
+        return f"Initial price must be within the valid range {valid_range_low:.2f} - {valid_range_high:.2f}."
+    return None
+
+# 🔹 Validate a non-interactive market spec with the same rules as get_user_input
+def validate_market_spec(spec):
+    """
+    Validates a market spec (dict) and returns it normalized to floats / lists of floats.
+
+    Required keys: buyer_demand, supply_coefficient, capacities, qualities, production_costs,
+    max_profit_percentage, min_profits, max_change_percentage, initial_prices.
+    num_sellers is optional (inferred from capacities). Raises ValueError on the first invalid field.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"spec: expected an object with the market fields, got {type(spec).__name__}")
+
+    def number(name):
+        try:
+            return float(spec[name])
+        except KeyError:
+            raise ValueError(f"{name}: missing") from None
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: Invalid input. Please enter a valid numeric value.") from None
+
+    def vector(name):
+        values = spec.get(name)
+        if values is None:
+            raise ValueError(f"{name}: missing")
+        if isinstance(values, str):
+            values = values.strip().split(',')
+        try:
+            return [float(v) for v in values]
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: Invalid input. Please enter only numeric values separated by commas.") from None
+
+    def require(name, error):
+        if error is not None:
+            raise ValueError(f"{name}: {error}")
+
+    capacities = vector("capacities")
+    num_sellers = number("num_sellers") if "num_sellers" in spec else len(capacities)
+    if not float(num_sellers).is_integer():
+        raise ValueError("num_sellers: Invalid input. Please enter a valid integer.")
+    num_sellers = int(num_sellers)
+    if num_sellers <= 0:
+        raise ValueError("num_sellers: Number of sellers must be positive.")
+
+    buyer_demand = number("buyer_demand")
+    require("buyer_demand", check_buyer_demand(buyer_demand))
+    supply_coefficient = number("supply_coefficient")
+    require("supply_coefficient", check_supply_coefficient(supply_coefficient))
+
+    min_capacity = minimum_capacity(buyer_demand, supply_coefficient, num_sellers)
+    require("capacities", check_vector(capacities, num_sellers, min_capacity))
+    qualities = vector("qualities")
+    require("qualities", check_vector(qualities, num_sellers, min_value=0, max_value=1))
+    production_costs = vector("production_costs")
+    require("production_costs", check_vector(production_costs, num_sellers))
+
+    max_profit_percentage = number("max_profit_percentage")
+    require("max_profit_percentage", check_max_profit_percentage(max_profit_percentage))
+
+    min_profits = vector("min_profits")
+    require("min_profits", check_vector(min_profits, num_sellers))
+    for i in range(num_sellers):
+        lower_bound, upper_bound = min_profit_bounds(capacities[i], production_costs[i], max_profit_percentage)
+        require(f"min_profits[{i}]", check_min_profit(min_profits[i], lower_bound, upper_bound))
+
+    max_change_percentage = number("max_change_percentage")
+    require("max_change_percentage", check_max_change_percentage(max_change_percentage))
+
+    initial_prices = vector("initial_prices")
+    require("initial_prices", check_vector(initial_prices, num_sellers))
+    for i in range(num_sellers):
+        require(f"initial_prices[{i}]", check_initial_price(initial_prices[i], production_costs[i], max_profit_percentage))
+
+    return {
+        "num_sellers": num_sellers,
+        "capacities": capacities,
+        "qualities": qualities,
+        "production_costs": production_costs,
+        "buyer_demand": buyer_demand,
+        "max_profit_percentage": max_profit_percentage,
+        "min_profits": min_profits,
+        "max_change_percentage": max_change_percentage,
+        "supply_coefficient": supply_coefficient,
+        "initial_prices": initial_prices,
+    }
+
 # Function to collect user inputs
 def get_user_input(num_sellers):
     """Collects and validates user inputs for seller parameters."""
@@ -10,14 +146,9 @@ def get_user_input(num_sellers):
             try:
                 values = input(prompt).strip().split(',')
                 values = [float(v) for v in values]
-                if len(values) != num_sellers:
-                    print(f"⚠ Error: You must enter exactly {num_sellers} values separated by commas.")
-                    continue
-                if min_value is not None and any(v < min_value for v in values):
-                    print(f"⚠ Error: Each value must be at least {min_value:.2f}.")
-                    continue
-                if max_value is not None and any(v > max_value for v in values):
-                    print(f"⚠ Error: Each value must not exceed {max_value:.2f}.")
+                error = check_vector(values, num_sellers, min_value, max_value)
+                if error:
+                    print(f"⚠ Error: {error}")
                     continue
                 return values
             except ValueError:
@@ -28,8 +159,9 @@ def get_user_input(num_sellers):
     while True:
         try:
             buyer_demand = float(input("Enter total demand of the buyer(kWh): ").strip())
-            if buyer_demand <= 0:
-                print("⚠ Error: Demand must be a positive number.")
+            error = check_buyer_demand(buyer_demand)
+            if error:
+                print(f"⚠ Error: {error}")
                 continue
             break
         except ValueError:
@@ -39,16 +171,17 @@ def get_user_input(num_sellers):
     while True:
         try:
             supply_coefficient = float(input("Enter supply coefficient (Fraction of suppliers needed to meet demand) (between 0.2 and 1): ").strip())
-            if 0.2 <= supply_coefficient <= 1:
+            error = check_supply_coefficient(supply_coefficient)
+            if error is None:
                 print(f"🔎 Debug: supply_coefficient received = {supply_coefficient}")
                 break
             else:
-                print("⚠ Error: Supply coefficient must be between 0.2 and 1.")
+                print(f"⚠ Error: {error}")
         except ValueError:
             print("⚠ Invalid input. Please enter a valid numeric value.")
 
     # Compute minimum capacity per seller
-    min_capacity = buyer_demand / (supply_coefficient * num_sellers)
+    min_capacity = minimum_capacity(buyer_demand, supply_coefficient, num_sellers)
     print(f"⚠ Note: Each seller must have a minimum capacity of {min_capacity:.2f}(kWh).")
 
     # Get seller parameters
@@ -65,18 +198,18 @@ def get_user_input(num_sellers):
     while True:
         try:
             max_profit_percentage = float(input("Enter max profit percentage for each supplier(seller) (e.g., 0.7 for 70%): ").strip())
-            if 0 <= max_profit_percentage <= 1:
+            error = check_max_profit_percentage(max_profit_percentage)
+            if error is None:
                 break
             else:
-                print("⚠ Error: Profit percentage must be between 0 and 1 (0% - 100%).")
+                print(f"⚠ Error: {error}")
         except ValueError:
             print("⚠ Invalid input. Please enter a valid numeric value.")
 
     # Get min_profit per seller with constraint
     min_profits = []
     for i in range(num_sellers):
-        lower_bound = 0
-        upper_bound = capacities[i] * (production_costs[i] * max_profit_percentage)
+        lower_bound, upper_bound = min_profit_bounds(capacities[i], production_costs[i], max_profit_percentage)
         prompt = (
             f"Enter minimum required Total profit for seller{i + 1} To stay in the competition ($) "
             f"(capacity: {capacities[i]}, cost: {production_costs[i]:.2f}, "
@@ -85,11 +218,12 @@ def get_user_input(num_sellers):
         while True:
             try:
                 min_profit = float(input(prompt).strip())
-                if lower_bound <= min_profit <= upper_bound:
+                error = check_min_profit(min_profit, lower_bound, upper_bound)
+                if error is None:
                     min_profits.append(min_profit)
                     break
                 else:
-                    print(f"⚠ Error: Minimum profit must be between {lower_bound:.2f} and {upper_bound:.2f}.")
+                    print(f"⚠ Error: {error}")
             except ValueError:
                 print("⚠ Invalid input. Please enter a valid numeric value.")
 
@@ -97,10 +231,11 @@ def get_user_input(num_sellers):
     while True:
         try:
             max_change_percentage = float(input("Enter max allowable price change percentage during rounds of battle (e.g., 0.1 for 10%): ").strip())
-            if 0 <= max_change_percentage <= 1:
+            error = check_max_change_percentage(max_change_percentage)
+            if error is None:
                 break
             else:
-                print("⚠ Error: Max change percentage must be between 0 and 1.")
+                print(f"⚠ Error: {error}")
         except ValueError:
             print("⚠ Invalid input. Please enter a valid numeric value.")
 
@@ -1,24 +1,22 @@
+import argparse
 import os
 import sys
 import json
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-from tkinter import Tk, Toplevel, messagebox, Button, Frame, WORD, filedialog
-from tkinter.scrolledtext import ScrolledText
-
-# Import stagano function
-from stagano import extract_hidden_hash
 
+# tkinter and stagano are imported where the GUI / license check needs them, so batch runs
+# and already-licensed sessions do not pay for them at startup
 from saki_market_game.blockchain_engine import (
     load_blockchain, save_blockchain, initialize_seller_nodes,
-    light_sync_for_new_nodes, distribute_rewards_v2
+    light_sync_for_new_nodes
 )
-from saki_market_game.saki_core import saki, initialize_prices
+from saki_market_game.saki_core import initialize_prices
 from saki_market_game.input_handler import get_user_input
+from saki_market_game.market_runner import clear_market, run_batch
+from saki_market_game.reports import ReportWriter, TABLE_FORMATS
 
 # --------------------First-run configuration------------------
 CONFIG_FIRST_RUN = "first_run.json"
+CONFIG_FILE = "saki_config.json"
 
 def is_first_run():
     """Check if program is running for the first time."""
@@ -39,6 +37,9 @@ def resource_path(relative_path):
 # ------------------------- License Popup -------------------------
 def show_license_popup():
     """Displays LICENSE.txt in a popup and asks user to accept."""
+    from tkinter import Tk, Toplevel, messagebox, Button, Frame, WORD
+    from tkinter.scrolledtext import ScrolledText
+
     root = Tk()
     root.withdraw()  # Hide the root window
 
@@ -82,40 +83,61 @@ def show_license_popup():
     return True
 
 
-# ------------------------- Collusion Detection -------------------------
-def detect_collusion(num_sellers, final_prices, buyer_shares, price_history, iterations, price_stability_threshold=0.01, min_iterations=10):
-    """Detects potential collusion among sellers."""
-    early_stop_flag = iterations < min_iterations
-    if early_stop_flag:
-        print(f"\n⚠ Warning: Market stabilized in only {iterations} iterations. Possible collusion detected!")
-
-    if len(price_history) < 2:
-        print("\n⚠ Not enough price history for collusion detection.")
-        return early_stop_flag
-
-    price_history = np.array(price_history)
-    avg_price_change = np.mean(np.abs(price_history[1:] - price_history[:-1]), axis=0)
-    price_stability_flag = np.all(avg_price_change < price_stability_threshold)
-
-    if price_stability_flag:
-        print("\n⚠ Warning: Prices remained almost unchanged during the game. Possible collusion detected!")
-
-    market_share_variance = np.std(buyer_shares)
-    equal_share_flag = market_share_variance < 0.05
-
-    if equal_share_flag:
-        print("\n⚠ Warning: Market shares among sellers are nearly identical. Possible collusion detected!")
-
-    collusion_detected = sum([early_stop_flag, price_stability_flag, equal_share_flag]) >= 2
+# ------------------------- Command Line -------------------------
+def parse_args(argv=None):
+    """Parses the command line (no arguments starts the interactive game)."""
+    parser = argparse.ArgumentParser(prog="saki-market", description="⚡ Saki Market Blockchain")
+    parser.add_argument("--batch", metavar="SPEC",
+                        help="Clear the market specs in a JSON/JSONL/CSV file ('-' for stdin) without prompts or dialogs")
+    parser.add_argument("--format", dest="spec_format", choices=["json", "jsonl", "csv"],
+                        help="Format of the batch spec (default: from the file extension or content)")
+    parser.add_argument("--base-dir", help="Tartchain folder for batch mode (default: the one in saki_config.json)")
+    parser.add_argument("--engine", choices=["loop", "vectorized"], default="vectorized",
+                        help="saki() engine used in batch mode")
+    parser.add_argument("--block-format", choices=["json", "binary"], default="json",
+                        help="Encoding of new blocks in batch mode (binary: compact, float arrays stored raw)")
+    parser.add_argument("--compression", choices=["zlib", "zstd"], default=None,
+                        help="Compression of binary blocks (zstd needs the 'zstandard' package)")
+    parser.add_argument("--no-reports", dest="reports", action="store_false",
+                        help="Skip the per-block tables and plots in batch mode")
+    parser.add_argument("--report-format", choices=list(TABLE_FORMATS), default="xlsx",
+                        help="Format of the price / share tables (parquet and feather need 'pyarrow')")
+    parser.add_argument("--report-workers", type=int, default=1,
+                        help="Background threads rendering reports in batch mode")
+    return parser.parse_args(argv)
+
+def run_headless(args):
+    """Batch mode: no license popup, file dialogs or prompts. Returns the process exit status."""
+    if is_first_run():
+        print("❌ License not validated yet. Run the program interactively once before using batch mode.")
+        return 1
 
-    if collusion_detected:
-        print("\n🚨 Collusion Confirmed! Market will be restarted with a new moderator seller.")
+    BASE_DIR = args.base_dir
+    if BASE_DIR is None and os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, "r") as f:
+            BASE_DIR = json.load(f).get("base_dir")
+    if not BASE_DIR:
+        print("❌ No Tartchain folder configured. Pass --base-dir.")
+        return 1
+    os.makedirs(BASE_DIR, exist_ok=True)
 
-    return collusion_detected
+    try:
+        processed, rejected = run_batch(args.batch, BASE_DIR, spec_format=args.spec_format, engine=args.engine,
+                                        reports=args.reports, block_format=args.block_format,
+                                        compression=args.compression, report_format=args.report_format,
+                                        report_workers=args.report_workers)
+    except ValueError as error:  # E.g. a legacy blockchain.json that cannot be migrated
+        print(f"❌ {error}")
+        return 1
+    return 1 if rejected else 0
 
 
 # ------------------------- Main Execution -------------------------
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch is not None:
+        return run_headless(args)
+
     if is_first_run():
         # 1️⃣ Show License Popup
         if not show_license_popup():
@@ -131,6 +153,9 @@ def main():
             sys.exit()
 
         # Ask user for audio license file
+        from tkinter import Tk, filedialog
+        from stagano import extract_hidden_hash
+
         root = Tk()
         root.withdraw()
         audio_file = filedialog.askopenfilename(
@@ -158,9 +183,9 @@ def main():
     print("🧠 Welcome to the ⚡ Saki Market Blockchain ⚡")
 
     # 5️⃣ Load or create config for Tartchain folder
-    CONFIG_FILE = "saki_config.json"
-
     def ask_user_for_directory():
+        from tkinter import Tk, filedialog
+
         root = Tk()
         root.withdraw()
         path = filedialog.askdirectory(title="Please choose where to save Tartchain data")
@@ -182,7 +207,11 @@ def main():
     print(f"📂 Tartchain folder set to: {BASE_DIR}")
 
     # 6️⃣ Blockchain logic
-    energy_chain = load_blockchain(BASE_DIR)
+    try:
+        energy_chain = load_blockchain(BASE_DIR)
+    except ValueError as error:  # A legacy blockchain.json that cannot be migrated
+        print(f"❌ {error}")
+        return 1
 
     while True:
         try:
@@ -204,56 +233,14 @@ def main():
     capacities, qualities, production_costs, buyer_demand, max_profit_percentage, min_profits, max_change_percentage, supply_coefficient = get_user_input(num_sellers)
     initial_prices = initialize_prices(num_sellers, production_costs, max_profit_percentage)
 
-    final_prices, buyer_shares, price_history, share_history, iterations = saki(
-        num_sellers, capacities, qualities, production_costs, buyer_demand, max_profit_percentage,
-        min_profits, max_change_percentage, initial_prices=initial_prices
+    num_sellers, final_prices, buyer_shares, price_history, share_history, iterations = clear_market(
+        energy_chain, num_sellers, capacities, qualities, production_costs, buyer_demand,
+        max_profit_percentage, min_profits, max_change_percentage, initial_prices, engine="vectorized"
     )
 
-    collusion_detected = detect_collusion(num_sellers, final_prices, buyer_shares, price_history, iterations)
-
-    if collusion_detected:
-        print("\n⚠ Collusion detected! Adding moderator and rerunning.")
-        moderator_capacity = max(capacities)
-        moderator_quality = min(0.99, max(qualities))
-        moderator_cost = min(production_costs)
-        moderator_price = min(min(final_prices) * 0.70, moderator_cost * 1.05)
-        moderator_min_profit = 0
-
-        num_sellers += 1
-        capacities.append(moderator_capacity)
-        qualities.append(moderator_quality)
-        production_costs.append(moderator_cost)
-        min_profits.append(moderator_min_profit)
-        final_prices.append(moderator_price)
-
-        final_prices, buyer_shares, price_history, share_history, iterations = saki(
-            num_sellers, capacities, qualities, production_costs, buyer_demand, max_profit_percentage,
-            min_profits, max_change_percentage, initial_prices=final_prices,
-            use_moderator=True, moderator_price=moderator_price
-        )
-
-    weighted_utility = np.zeros(num_sellers)
-    valid_indices = np.array(final_prices) > 0
-    if np.any(valid_indices):
-        weighted_utility[valid_indices] = (np.array(qualities)[valid_indices] / np.array(final_prices)[valid_indices]) * np.array(buyer_shares)[valid_indices]
-        weighted_utility = weighted_utility / np.sum(weighted_utility) if np.sum(weighted_utility) > 0 else np.full(num_sellers, 1 / num_sellers)
-    else:
-        weighted_utility = np.full(num_sellers, 1 / num_sellers)
-
-    rewards, total_payment_with_reward = distribute_rewards_v2(
-        final_prices, buyer_shares, weighted_utility, qualities, production_costs, num_sellers
-    )
-
-    transactions = {
-        "final_prices": final_prices.tolist() if isinstance(final_prices, np.ndarray) else final_prices,
-        "buyer_shares": buyer_shares.tolist() if isinstance(buyer_shares, np.ndarray) else buyer_shares,
-        "iterations": iterations,
-        "rewards": rewards.tolist() if isinstance(rewards, np.ndarray) else rewards,
-        "total_payment_with_reward": total_payment_with_reward
-    }
-
-    energy_chain.add_block(transactions)
-    print("\n✅ Block added successfully!")
+    # Render the reports in the background while the chain is saved and the results are shown
+    report_writer = ReportWriter()
+    report_writer.submit(BASE_DIR, energy_chain.chain[-1].index, num_sellers, price_history, share_history)
 
     save_blockchain(energy_chain, BASE_DIR)
     print("✅ Blockchain saved successfully!")
@@ -263,40 +250,10 @@ def main():
     print(f"🔹 Buyer Shares: {[round(s, 2) for s in buyer_shares]}")
     print(f"🔹 Number of Iterations: {iterations}")
 
-    block_index = len(energy_chain.chain) - 1
-    block_folder = os.path.join(BASE_DIR, f"Block_{block_index}")
-    os.makedirs(block_folder, exist_ok=True)
-
-    df_prices = pd.DataFrame(price_history, columns=[f"Seller {i + 1}" for i in range(num_sellers)])
-    df_shares = pd.DataFrame(share_history, columns=[f"Seller {i + 1}" for i in range(num_sellers)])
-    df_prices.to_excel(os.path.join(block_folder, "Saki_Market_Prices.xlsx"), index=True)
-    df_shares.to_excel(os.path.join(block_folder, "Saki_Market_Shares.xlsx"), index=True)
-
-    plt.figure(figsize=(10, 5))
-    for i in range(num_sellers):
-        plt.plot(range(len(price_history)), [p[i] for p in price_history], marker='o', label=f"Seller {i + 1}")
-    plt.xlabel("Iteration")
-    plt.ylabel("Price")
-    plt.title("Price Evolution Over Iterations")
-    plt.legend()
-    plt.grid()
-    plt.savefig(os.path.join(block_folder, "Price_Evolution.png"))
-    plt.close()
-
-    plt.figure(figsize=(10, 5))
-    for i in range(num_sellers):
-        plt.plot(range(len(share_history)), [s[i] for s in share_history], marker='o', label=f"Seller {i + 1}")
-    plt.xlabel("Iteration")
-    plt.ylabel("Market Share")
-    plt.title("Market Share Evolution Over Iterations")
-    plt.legend()
-    plt.grid()
-    plt.savefig(os.path.join(block_folder, "Market_Share_Evolution.png"))
-    plt.close()
-
-    print(f"\n📊 All plots saved in {block_folder}")
+    for block_folder in report_writer.close():
+        print(f"\n📊 All plots saved in {block_folder}")
     input("\n🔚 Press Enter to exit the program...")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+
+
+# 🔹 Price / share history store for saki()
+class MarketHistory:
+    def __init__(self, num_sellers, max_rows, mode="full", path=None, window=100):
+        """
+        Preallocated store for the per-iteration prices and buyer shares of one market run.
+
+        Parameters:
+        - num_sellers (int): Number of sellers (columns).
+        - max_rows (int): Maximum number of rows to record (max_iterations + 1 for saki()).
+        - mode (str): "full" keeps every row in a preallocated 2-D array, "summary" keeps only
+          running statistics plus a ring buffer of the last `window` rows (bounded memory).
+        - path (str, optional): Directory for memory-mapped .npy files (full mode only);
+          rows beyond len(history) in those files are unused.
+        - window (int): Ring buffer length in summary mode.
+        """
+        if mode not in ("full", "summary"):
+            raise ValueError(f"Unknown history mode: {mode!r} (expected 'full' or 'summary')")
+        self.num_sellers = num_sellers
+        self.mode = mode
+        self.path = path
+        self.capacity = max_rows if mode == "full" else max(1, min(window, max_rows))
+        self.count = 0  # Total rows appended so far
+
+        if mode == "full" and path is not None:
+            os.makedirs(path, exist_ok=True)
+            self._prices = np.lib.format.open_memmap(
+                os.path.join(path, "price_history.npy"), mode="w+", dtype=float, shape=(self.capacity, num_sellers))
+            self._shares = np.lib.format.open_memmap(
+                os.path.join(path, "share_history.npy"), mode="w+", dtype=float, shape=(self.capacity, num_sellers))
+        else:
+            self._prices = np.zeros((self.capacity, num_sellers))
+            self._shares = np.zeros((self.capacity, num_sellers))
+
+        # Running statistics (kept in every mode)
+        self._price_sum = np.zeros(num_sellers)
+        self._share_sum = np.zeros(num_sellers)
+        self._abs_change_sum = np.zeros(num_sellers)
+        self._last_prices = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, prices, buyer_shares):
+        """Records one row of prices and buyer shares."""
+        prices = np.asarray(prices, dtype=float)
+        buyer_shares = np.asarray(buyer_shares, dtype=float)
+        if self.mode == "full" and self.count >= self.capacity:
+            raise IndexError(f"MarketHistory is full ({self.capacity} rows).")
+
+        row = self.count % self.capacity
+        self._prices[row] = prices
+        self._shares[row] = buyer_shares
+        self.count += 1
+
+        self._price_sum += prices
+        self._share_sum += buyer_shares
+        if self._last_prices is not None:
+            self._abs_change_sum += np.abs(prices - self._last_prices)
+        self._last_prices = prices.copy()
+
+    def _rows(self, data):
+        if self.count <= self.capacity:
+            return data[:self.count]
+        start = self.count % self.capacity  # Oldest row in the ring buffer
+        return np.concatenate((data[start:], data[:start]))
+
+    def prices(self):
+        """Returns the stored price rows in chronological order (the last `window` rows in summary mode)."""
+        return self._rows(self._prices)
+
+    def shares(self):
+        """Returns the stored share rows in chronological order (the last `window` rows in summary mode)."""
+        return self._rows(self._shares)
+
+    def mean_abs_price_change(self):
+        """Average absolute price change per seller over the whole run."""
+        return self._abs_change_sum / max(self.count - 1, 1)
+
+    def mean_prices(self):
+        """Average price per seller over the whole run."""
+        return self._price_sum / max(self.count, 1)
+
+    def mean_shares(self):
+        """Average buyer share per seller over the whole run."""
+        return self._share_sum / max(self.count, 1)
+
+    def flush(self):
+        """Writes memory-mapped rows to disk (no-op for in-memory stores)."""
+        if isinstance(self._prices, np.memmap):
+            self._prices.flush()
+            self._shares.flush()
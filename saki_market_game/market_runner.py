@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .blockchain_engine import (
+    load_blockchain, save_blockchain, initialize_seller_nodes,
+    light_sync_for_new_nodes, distribute_rewards_v2, pocc_weighted_utility
+)
+from .collusion import CollusionMonitor
+from .input_handler import validate_market_spec
+from .reports import ReportWriter
+from .saki_core import saki
+
+
+# ------------------------- Market Clearing -------------------------
+def clear_market(energy_chain, num_sellers, capacities, qualities, production_costs, buyer_demand,
+                 max_profit_percentage, min_profits, max_change_percentage, initial_prices, engine="loop"):
+    """
+    Runs one market (with a moderator rerun if collusion is detected), distributes PoCC rewards
+    and appends the resulting block to the chain. Collusion is tracked online, so a collusive
+    first run stops as soon as it is flagged.
+
+    Returns:
+    - num_sellers (int): Sellers in the final market (including a moderator, if one was added).
+    - final_prices, buyer_shares, price_history, share_history, iterations: As returned by saki().
+    """
+    capacities, qualities = list(capacities), list(qualities)
+    production_costs, min_profits = list(production_costs), list(min_profits)
+
+    collusion_monitor = CollusionMonitor(num_sellers)
+    final_prices, buyer_shares, price_history, share_history, iterations = saki(
+        num_sellers, capacities, qualities, production_costs, buyer_demand, max_profit_percentage,
+        min_profits, max_change_percentage, initial_prices=list(initial_prices), engine=engine,
+        collusion_monitor=collusion_monitor
+    )
+
+    collusion_detected = collusion_monitor.finish(iterations, buyer_shares)
+
+    if collusion_detected:
+        print("\n⚠ Collusion detected! Adding moderator and rerunning.")
+        moderator_capacity = max(capacities)
+        moderator_quality = min(0.99, max(qualities))
+        moderator_cost = min(production_costs)
+        moderator_price = min(min(final_prices) * 0.70, moderator_cost * 1.05)
+        moderator_min_profit = 0
+
+        num_sellers += 1
+        capacities.append(moderator_capacity)
+        qualities.append(moderator_quality)
+        production_costs.append(moderator_cost)
+        min_profits.append(moderator_min_profit)
+        final_prices.append(moderator_price)
+
+        final_prices, buyer_shares, price_history, share_history, iterations = saki(
+            num_sellers, capacities, qualities, production_costs, buyer_demand, max_profit_percentage,
+            min_profits, max_change_percentage, initial_prices=final_prices,
+            use_moderator=True, moderator_price=moderator_price, engine=engine
+        )
+
+    weighted_utility = pocc_weighted_utility(final_prices, buyer_shares, qualities)[0]
+
+    rewards, total_payment_with_reward = distribute_rewards_v2(
+        final_prices, buyer_shares, weighted_utility, qualities, production_costs, num_sellers
+    )
+
+    transactions = {
+        "final_prices": final_prices.tolist() if isinstance(final_prices, np.ndarray) else final_prices,
+        "buyer_shares": buyer_shares.tolist() if isinstance(buyer_shares, np.ndarray) else buyer_shares,
+        "iterations": iterations,
+        "rewards": rewards.tolist() if isinstance(rewards, np.ndarray) else rewards,
+        "total_payment_with_reward": total_payment_with_reward
+    }
+
+    energy_chain.add_block(transactions)
+    print("\n✅ Block added successfully!")
+
+    return num_sellers, final_prices, buyer_shares, price_history, share_history, iterations
+
+
+# ------------------------- Batch Market Specs -------------------------
+def load_market_specs(source, spec_format=None):
+    """
+    Yields raw market spec dicts from a file path, or from stdin when source is "-".
+
+    Supported formats: "json" (one object or a list of objects), "jsonl" (one object per line)
+    and "csv" (one market per row; vector columns hold comma-separated values, as at the prompts).
+    The format is taken from the file extension or, for stdin, detected from the content.
+    A JSONL line that is not valid JSON, or a CSV row with more values than header columns, is
+    yielded as a ValueError instead of a dict, so the caller can reject it and go on.
+    """
+    if spec_format is None and source != "-":
+        extension = os.path.splitext(source)[1].lower()
+        spec_format = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(extension)
+
+    if source == "-":
+        text = sys.stdin.read()
+    else:
+        with open(source, "r", encoding="utf-8") as file:
+            text = file.read()
+
+    if spec_format is None:
+        stripped = text.lstrip()
+        if stripped.startswith("["):
+            spec_format = "json"
+        elif stripped.startswith("{"):
+            try:
+                json.loads(text)
+                spec_format = "json"
+            except json.JSONDecodeError:
+                spec_format = "jsonl"
+        else:
+            spec_format = "csv"
+
+    if spec_format == "json":
+        data = json.loads(text)
+        yield from (data if isinstance(data, list) else [data])
+    elif spec_format == "jsonl":
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield ValueError(f"line {line_number}: invalid JSON ({error.msg})")
+    elif spec_format == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            if None in row:  # DictReader files surplus values under the key None
+                yield ValueError(f"line {reader.line_num}: more values than header columns")
+                continue
+            yield {key.strip(): value for key, value in row.items() if value not in (None, "")}
+    else:
+        raise ValueError(f"Unknown market spec format: {spec_format!r} (expected 'json', 'jsonl' or 'csv')")
+
+
+def run_batch(source, BASE_DIR, spec_format=None, engine="vectorized", reports=True,
+              block_format="json", compression=None, report_format="xlsx", report_workers=1):
+    """
+    Clears every market spec from source back to back, without prompts or dialogs.
+
+    Each spec is validated with the same rules as the interactive input; invalid specs are
+    reported and skipped. The chain is saved once at the end (also if a run is interrupted).
+    New blocks are written with block_format and compression (see load_blockchain).
+    Reports (unless reports=False) are rendered in the background by report_workers threads,
+    as report_format tables (see reports.save_market_reports), while later markets clear.
+
+    Returns:
+    - processed (int): Markets cleared and appended to the chain.
+    - rejected (int): Specs that failed validation.
+    """
+    report_writer = ReportWriter(max_workers=report_workers, table_format=report_format) if reports else None
+    energy_chain = load_blockchain(BASE_DIR, block_format=block_format, compression=compression)
+    processed = rejected = 0
+    start = time.perf_counter()
+
+    try:
+        for number, raw_spec in enumerate(load_market_specs(source, spec_format), start=1):
+            try:
+                if isinstance(raw_spec, ValueError):
+                    raise raw_spec
+                spec = validate_market_spec(raw_spec)
+            except ValueError as error:
+                print(f"⚠ Market spec {number} rejected: {error}")
+                rejected += 1
+                continue
+
+            num_sellers = spec["num_sellers"]
+            initialize_seller_nodes(num_sellers, BASE_DIR)
+            light_sync_for_new_nodes(energy_chain, num_sellers, BASE_DIR)
+
+            num_sellers, final_prices, buyer_shares, price_history, share_history, iterations = clear_market(
+                energy_chain, num_sellers, spec["capacities"], spec["qualities"], spec["production_costs"],
+                spec["buyer_demand"], spec["max_profit_percentage"], spec["min_profits"],
+                spec["max_change_percentage"], spec["initial_prices"], engine=engine
+            )
+            if report_writer is not None:
+                report_writer.submit(BASE_DIR, energy_chain.chain[-1].index, num_sellers, price_history, share_history)
+            processed += 1
+    finally:
+        save_blockchain(energy_chain, BASE_DIR)
+        if report_writer is not None:
+            report_writer.close()
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"\n📈 Batch finished: {processed} market(s) cleared, {rejected} rejected, "
+          f"{elapsed:.2f}s ({processed / elapsed:.1f} markets/s).")
+    return processed, rejected
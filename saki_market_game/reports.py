@@ -0,0 +1,145 @@
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+TABLE_FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+MAX_PLOT_POINTS = 500  # Longer histories are downsampled for plotting (tables keep every row)
+MARKER_LIMIT = 50  # Points per line up to which markers are drawn
+LEGEND_LIMIT = 20  # Sellers up to which a legend is drawn
+
+
+def check_report_format(table_format):
+    """Raises ValueError for an unknown table format or a missing optional dependency."""
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unknown report format: {table_format!r} (expected one of {', '.join(TABLE_FORMATS)})")
+    if table_format in ("parquet", "feather") and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError(f"The {table_format} report format requires the 'pyarrow' package.")
+
+
+def plot_rows(num_rows, max_points=MAX_PLOT_POINTS):
+    """Evenly spaced row indices (first and last included) for plotting at most max_points points."""
+    if num_rows <= max_points:
+        return np.arange(num_rows)
+    return np.unique(np.linspace(0, num_rows - 1, max_points).round().astype(int))
+
+
+def _write_table(path, history, num_sellers, table_format):
+    import pandas as pd
+
+    frame = pd.DataFrame(history, columns=[f"Seller {i + 1}" for i in range(num_sellers)])
+    if table_format == "xlsx":
+        frame.to_excel(path, index=True)
+    elif table_format == "csv":
+        frame.to_csv(path, index=True, index_label="Iteration")
+    else:
+        frame = frame.rename_axis("Iteration").reset_index()  # Columnar formats need a plain index
+        if table_format == "parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_feather(path)
+
+
+def _plot_evolution(path, history, num_sellers, ylabel, title, max_plot_points):
+    # Figure objects instead of pyplot state, so reports can render on worker threads
+    from matplotlib.figure import Figure
+
+    rows = plot_rows(len(history), max_plot_points)
+    marker = 'o' if len(rows) <= MARKER_LIMIT else None
+    figure = Figure(figsize=(10, 5))
+    axes = figure.subplots()
+    for i in range(num_sellers):
+        axes.plot(rows, history[rows, i], marker=marker, label=f"Seller {i + 1}")
+    axes.set_xlabel("Iteration")
+    axes.set_ylabel(ylabel)
+    axes.set_title(title)
+    if num_sellers <= LEGEND_LIMIT:
+        axes.legend()
+    axes.grid()
+    figure.savefig(path)
+
+
+# 🔹 Tables and evolution plots of one market
+def save_market_reports(BASE_DIR, block_index, num_sellers, price_history, share_history,
+                        table_format="xlsx", max_plot_points=MAX_PLOT_POINTS):
+    """
+    Writes the price / share tables and evolution plots of one market into its block folder.
+
+    Parameters:
+    - table_format (str): "xlsx" (default), "csv", or the columnar "parquet" / "feather"
+      (these two need pyarrow).
+    - max_plot_points (int): Histories with more rows are downsampled for the plots.
+
+    Returns:
+    - block_folder (str): Folder the reports were written to.
+    """
+    check_report_format(table_format)
+    block_folder = os.path.join(BASE_DIR, f"Block_{block_index}")
+    os.makedirs(block_folder, exist_ok=True)
+    price_history = np.asarray(price_history, dtype=float)
+    share_history = np.asarray(share_history, dtype=float)
+
+    extension = TABLE_FORMATS[table_format]
+    _write_table(os.path.join(block_folder, f"Saki_Market_Prices{extension}"), price_history, num_sellers, table_format)
+    _write_table(os.path.join(block_folder, f"Saki_Market_Shares{extension}"), share_history, num_sellers, table_format)
+
+    _plot_evolution(os.path.join(block_folder, "Price_Evolution.png"), price_history, num_sellers,
+                    "Price", "Price Evolution Over Iterations", max_plot_points)
+    _plot_evolution(os.path.join(block_folder, "Market_Share_Evolution.png"), share_history, num_sellers,
+                    "Market Share", "Market Share Evolution Over Iterations", max_plot_points)
+
+    return block_folder
+
+
+# 🔹 Background report generation
+class ReportWriter:
+    def __init__(self, max_workers=1, processes=False, table_format="xlsx", max_plot_points=MAX_PLOT_POINTS):
+        """
+        Renders market reports on a worker thread (or process) pool while the next market clears.
+
+        At most 2 × max_workers reports are queued; submit() waits for the oldest one beyond that,
+        so memory stays bounded when markets clear faster than reports render.
+        """
+        check_report_format(table_format)
+        self.table_format = table_format
+        self.max_plot_points = max_plot_points
+        self.max_pending = 2 * max_workers
+        executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._executor = executor_class(max_workers=max_workers)
+        self._pending = []
+        self.folders = []
+        self.failures = 0
+
+    def submit(self, BASE_DIR, block_index, num_sellers, price_history, share_history):
+        """Queues the reports of one market (the histories are copied) and returns a Future."""
+        while len(self._pending) >= self.max_pending:
+            self._collect(self._pending.pop(0))
+        future = self._executor.submit(
+            save_market_reports, BASE_DIR, block_index, num_sellers, np.array(price_history, dtype=float),
+            np.array(share_history, dtype=float), self.table_format, self.max_plot_points)
+        self._pending.append(future)
+        return future
+
+    def _collect(self, future):
+        try:
+            self.folders.append(future.result())
+        except Exception as error:
+            self.failures += 1
+            print(f"⚠ Report generation failed: {error}")
+
+    def close(self):
+        """Waits for every queued report and stops the pool; returns the block folders written."""
+        if self._pending:
+            print(f"📊 Waiting for {len(self._pending)} report(s) still rendering...")
+        for future in self._pending:
+            self._collect(future)
+        self._pending = []
+        self._executor.shutdown()
+        return self.folders
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,150 @@
+import numpy as np
+
+from .saki_core import AdamOptimizerBank, minimum_profit_price, volatility_learning_rate
+
+
+# 🔹 Stack per-market seller lists of uneven length into padded arrays
+def stack_markets(markets, fill_value=0.0):
+    """
+    Stacks a list of per-market seller vectors into a (markets × sellers) array.
+
+    Parameters:
+    - markets (list of lists): One list of seller values per market (lengths may differ).
+    - fill_value (float, optional): Value written into padded slots.
+
+    Returns:
+    - values (ndarray): Padded array of shape (num_markets, max_sellers).
+    - seller_mask (ndarray): Boolean array, True where a real seller exists.
+    """
+    num_markets = len(markets)
+    max_sellers = max((len(m) for m in markets), default=0)
+    values = np.full((num_markets, max_sellers), fill_value, dtype=float)
+    seller_mask = np.zeros((num_markets, max_sellers), dtype=bool)
+    for k, market in enumerate(markets):
+        values[k, :len(market)] = market
+        seller_mask[k, :len(market)] = True
+    return values, seller_mask
+
+
+# 🔹 Volatility-based learning rate for every market at once
+def batch_adaptive_learning_rate(iteration, prev_prices, current_prices, seller_mask, min_lr=0.005, base_max_lr=0.05):
+    """Per-market version of saki_core.adaptive_learning_rate (one rate per market, no printing)."""
+    counts = np.maximum(seller_mask.sum(axis=1), 1)
+    price_changes = np.where(seller_mask, current_prices - prev_prices, 0.0)
+    mean_change = price_changes.sum(axis=1) / counts
+    centered = np.where(seller_mask, price_changes - mean_change[:, None], 0.0)
+    price_std = np.sqrt((centered ** 2).sum(axis=1) / counts)
+    return volatility_learning_rate(iteration, np.abs(mean_change), price_std, min_lr, base_max_lr)
+
+
+# 🔹 Clear many independent markets in one vectorized pass
+def saki_batch(capacities, qualities, production_costs, buyer_demand, max_profit_percentage, min_profits,
+               max_change_percentage, initial_prices, seller_mask=None, tolerance=0.01, max_iterations=1000):
+    """
+    Runs the saki() market game for many independent markets simultaneously.
+
+    Every seller parameter is a (markets × sellers) array; markets with fewer sellers are padded
+    and described by seller_mask (see stack_markets). Market-level parameters may be scalars or
+    arrays of shape (markets,). A market that has converged is frozen while the others continue.
+    Each market follows the same update rules as saki(engine="vectorized").
+
+    Parameters:
+    - capacities, qualities, production_costs, min_profits, initial_prices (array-like):
+      Seller parameters of shape (num_markets, max_sellers).
+    - buyer_demand, max_profit_percentage, max_change_percentage (float or array-like):
+      Market parameters, scalar or of shape (num_markets,).
+    - seller_mask (array-like, optional): True for real sellers; defaults to all sellers valid.
+    - tolerance (float): Convergence threshold for price changes.
+    - max_iterations (int): Maximum number of iterations allowed.
+
+    Returns:
+    - final_prices (ndarray): Equilibrium prices per market (NaN in padded slots).
+    - buyer_shares (ndarray): Allocated shares per market (0 in padded slots).
+    - iterations (ndarray): Number of iterations each market took.
+    """
+    prices = np.array(initial_prices, dtype=float, ndmin=2)
+    num_markets, num_sellers = prices.shape
+    if seller_mask is None:
+        seller_mask = np.ones((num_markets, num_sellers), dtype=bool)
+    seller_mask = np.asarray(seller_mask, dtype=bool)
+
+    def seller_array(values, fill_value):
+        return np.where(seller_mask, np.asarray(values, dtype=float), fill_value)
+
+    def market_column(values):
+        return np.broadcast_to(np.asarray(values, dtype=float), (num_markets,))[:, None]
+
+    # Padded sellers get zero capacity/quality so they never receive utility or a share
+    capacities = seller_array(capacities, 0.0)
+    qualities = seller_array(qualities, 0.0)
+    production_costs = seller_array(production_costs, 1.0)
+    min_profits = seller_array(min_profits, 0.0)
+    prices = np.where(seller_mask, prices, 1.0)
+    buyer_demand = market_column(buyer_demand)
+    max_change_percentage = market_column(max_change_percentage)
+    price_cap = production_costs * (1 + market_column(max_profit_percentage))
+    seller_counts = np.maximum(seller_mask.sum(axis=1, keepdims=True), 1)
+
+    adam_optimizers = AdamOptimizerBank(prices.shape, lr=0.05)  # One Adam state per (market, seller)
+
+    buyer_shares = np.zeros_like(prices)
+    previous_step_prices = prices.copy()  # Prices one iteration back, for the adaptive learning rate
+    running = np.ones(num_markets, dtype=bool)
+    iterations = np.full(num_markets, max_iterations, dtype=int)
+    reset_threshold = max(10, max_iterations // 20)
+    no_significant_change_count = np.zeros(num_markets, dtype=int)
+
+    iteration = 0
+    while iteration < max_iterations and np.any(running):
+        iteration += 1
+        prev_prices = prices.copy()
+
+        # ✅ Utility scores and buyer allocation per market
+        utility_scores = (qualities / prices) * capacities
+        totals = utility_scores.sum(axis=1, keepdims=True)
+        no_utility = totals == 0
+        utility_scores = np.where(no_utility & seller_mask, 1.0 / seller_counts, utility_scores)
+        totals = np.where(no_utility, utility_scores.sum(axis=1, keepdims=True), totals)
+        weighted_utility = utility_scores / np.where(totals == 0, 1.0, totals)
+        new_shares = np.minimum(weighted_utility * buyer_demand, capacities)
+        buyer_shares = np.where(running[:, None], new_shares, buyer_shares)
+
+        active = seller_mask & (buyer_shares > 0) & running[:, None]
+        profit_gradient = buyer_shares - (prices - production_costs)
+
+        # ✅ Learning rate: Adam warm-up, then one volatility-based rate per market
+        if iteration <= 10:
+            learning_rate = adam_optimizers.update(profit_gradient, active)
+        else:
+            learning_rate = batch_adaptive_learning_rate(iteration, previous_step_prices, prices, seller_mask)[:, None]
+
+        # ✅ Gradient step, max change restriction and valid profit range
+        new_prices = prices + learning_rate * profit_gradient
+        max_change = prices * max_change_percentage
+        new_prices = np.maximum(np.minimum(new_prices, prices + max_change), prices - max_change)
+        new_prices = np.minimum(np.maximum(new_prices, production_costs), price_cap)
+
+        # ✅ Minimum profit constraint: exact price floor, capped at the max profit price
+        new_prices = np.maximum(new_prices, minimum_profit_price(production_costs, min_profits, buyer_shares, price_cap))
+
+        previous_step_prices = np.where(running[:, None], prices, previous_step_prices)
+        prices = np.where(active, new_prices, prices)
+
+        # ✅ Per-market convergence and stagnation checks
+        price_difference = np.abs(prices - prev_prices)
+        settled = np.all((price_difference < tolerance) | ~seller_mask, axis=1)
+        no_significant_change_count = np.where(settled & running, no_significant_change_count + 1, 0)
+
+        stagnant = no_significant_change_count >= reset_threshold
+        if np.any(stagnant):
+            adam_optimizers.reset(stagnant)
+            no_significant_change_count[stagnant] = 0
+
+        converged = running & np.all(
+            (price_difference <= tolerance + 1e-5 * np.abs(prices)) | ~seller_mask, axis=1)
+        iterations[converged] = iteration
+        running &= ~converged
+
+    final_prices = np.where(seller_mask, prices, np.nan)
+    buyer_shares = np.where(seller_mask, buyer_shares, 0.0)
+    return final_prices, buyer_shares, iterations
@@ -1,11 +1,6 @@
-import hashlib
-import json
-import os
-import time
-
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+
+from .market_history import MarketHistory
 
 # Function to initialize prices within the valid range
 def initialize_prices(num_sellers, production_costs, max_profit_percentage):
@@ -47,6 +42,52 @@ class AdamOptimizer:
         m_hat = self.m / (1 - self.beta1 ** self.t)
         v_hat = self.v / (1 - self.beta2 ** self.t)
         return self.lr * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+# Array-backed Adam optimizer state for a whole bank of sellers
+class AdamOptimizerBank:
+    def __init__(self, shape, lr=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        """Initializes one Adam state (m, v, t) per entry of an array of the given shape."""
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.m = np.zeros(shape)
+        self.v = np.zeros(shape)
+        self.t = np.zeros(shape)
+
+    def update(self, gradients, mask=None):
+        """Updates the entries selected by mask (all by default) and returns their learning rates (0 elsewhere)."""
+        gradients = np.asarray(gradients, dtype=float)
+        if mask is None:
+            mask = np.ones(self.m.shape, dtype=bool)
+        g = gradients[mask]
+        self.t[mask] += 1
+        self.m[mask] = self.beta1 * self.m[mask] + (1 - self.beta1) * g
+        self.v[mask] = self.beta2 * self.v[mask] + (1 - self.beta2) * (g ** 2)
+        m_hat = self.m[mask] / (1 - self.beta1 ** self.t[mask])
+        v_hat = self.v[mask] / (1 - self.beta2 ** self.t[mask])
+        learning_rates = np.zeros(self.m.shape)
+        learning_rates[mask] = self.lr * m_hat / (np.sqrt(v_hat) + self.epsilon)
+        return learning_rates
+
+    def reset(self, mask=None):
+        """Resets the optimizer state in place, for every entry or only where mask is True."""
+        if mask is None:
+            mask = np.ones(self.m.shape, dtype=bool)
+        self.m[mask] = 0
+        self.v[mask] = 0
+        self.t[mask] = 0
+
+# Learning rate rule shared by adaptive_learning_rate and PriceVolatilityTracker
+def volatility_learning_rate(iteration, price_change_mean, price_std, min_lr=0.005, base_max_lr=0.05):
+    """Maps volatility statistics (scalars or per-seller arrays) to a learning rate."""
+    # Dynamically adjust max_lr based on volatility
+    dynamic_max_lr = base_max_lr + np.minimum(0.05, price_std)
+
+    # Keep learning rate high when volatility is significant, otherwise decay it with the iteration count
+    calm_lr = np.maximum(min_lr, np.minimum(dynamic_max_lr, 1 / (iteration ** 0.5)))
+    return np.where((price_change_mean > 0.1) | (price_std > 0.1), dynamic_max_lr, calm_lr)
+
 # Function to dynamically adjust learning rate based on price volatility
 def adaptive_learning_rate(iteration, prev_prices, current_prices, min_lr=0.005, base_max_lr=0.05):
     """Dynamically adjusts the learning rate based on price volatility using mean change and standard deviation."""
@@ -54,24 +95,72 @@ def adaptive_learning_rate(iteration, prev_prices, current_prices, min_lr=0.005,
     price_change_mean = float(np.abs(np.mean(price_changes)))  # Convert to standard float
     price_std = float(np.std(price_changes))  # Convert to standard float
 
-    # Dynamically adjust max_lr based on volatility
-    dynamic_max_lr = float(base_max_lr + min(0.05, price_std))  # Ensure standard float type
-
-    # Determine learning rate based on volatility
-    if price_change_mean > 0.1 or price_std > 0.1:
-        lr = dynamic_max_lr  # Keep learning rate high when volatility is significant
-    else:
-        lr = max(float(min_lr), min(dynamic_max_lr, float(1 / (iteration ** 0.5))))  # Ensure standard float
+    lr = float(volatility_learning_rate(iteration, price_change_mean, price_std, min_lr, base_max_lr))
 
     # Print learning rate details for debugging and analysis
     print(f"Iteration {iteration}: Learning Rate = {lr:.4f}, Mean Change = {price_change_mean:.4f}, Std Dev = {price_std:.4f}")
 
     return lr
 
+# Price volatility statistics, updated once per iteration instead of once per seller
+class PriceVolatilityTracker:
+    def __init__(self, num_sellers, per_seller=False, decay=0.9):
+        """
+        Tracks the price-change statistics used by the adaptive learning rate.
+
+        With per_seller=False (default) the statistics describe the latest market-wide price step
+        (mean and standard deviation across sellers), so every seller shares one learning rate.
+        With per_seller=True each seller keeps an exponentially weighted mean and variance of its
+        own price changes over time and gets its own learning rate (heterogeneous markets).
+        """
+        self.per_seller = per_seller
+        self.decay = decay
+        self.steps = 0
+        self.price_change_mean = np.zeros(num_sellers) if per_seller else 0.0
+        self.price_std = np.zeros(num_sellers) if per_seller else 0.0
+        self._ewm_change = np.zeros(num_sellers)
+        self._ewm_square = np.zeros(num_sellers)
+
+    def update(self, prev_prices, current_prices):
+        """Records one completed iteration's price change."""
+        price_changes = np.asarray(current_prices, dtype=float) - np.asarray(prev_prices, dtype=float)
+        self.steps += 1
+        if self.per_seller:
+            self._ewm_change = self.decay * self._ewm_change + (1 - self.decay) * price_changes
+            self._ewm_square = self.decay * self._ewm_square + (1 - self.decay) * price_changes ** 2
+            correction = 1 - self.decay ** self.steps
+            mean_change = self._ewm_change / correction
+            self.price_change_mean = np.abs(mean_change)
+            self.price_std = np.sqrt(np.maximum(self._ewm_square / correction - mean_change ** 2, 0))
+        else:
+            self.price_change_mean = float(np.abs(np.mean(price_changes)))
+            self.price_std = float(np.std(price_changes))
+
+    def learning_rate(self, iteration, min_lr=0.005, base_max_lr=0.05):
+        """Returns the learning rate for this iteration (a float, or one rate per seller)."""
+        lr = volatility_learning_rate(iteration, self.price_change_mean, self.price_std, min_lr, base_max_lr)
+        if self.per_seller:
+            print(f"Iteration {iteration}: Mean Learning Rate = {np.mean(lr):.4f}, "
+                  f"Mean Change = {np.mean(self.price_change_mean):.4f}, Std Dev = {np.mean(self.price_std):.4f}")
+            return lr
+        lr = float(lr)
+        print(f"Iteration {iteration}: Learning Rate = {lr:.4f}, Mean Change = {self.price_change_mean:.4f}, Std Dev = {self.price_std:.4f}")
+        return lr
+
+# Price floor that satisfies the minimum profit constraint
+def minimum_profit_price(production_costs, min_profits, buyer_shares, price_cap):
+    """Returns the lowest price meeting each seller's minimum profit at its current share, capped at price_cap."""
+    production_costs = np.asarray(production_costs, dtype=float)
+    buyer_shares = np.asarray(buyer_shares, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        required_margin = np.where(buyer_shares > 0, np.asarray(min_profits, dtype=float) / buyer_shares, 0.0)
+    return np.minimum(production_costs + required_margin, price_cap)
+
 # Function to simulate the market using Nash equilibrium and Adam optimizer
 def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max_profit_percentage, min_profits,
          max_change_percentage, tolerance=0.01, max_iterations=1000, initial_prices=None,
-         use_moderator=False, moderator_price=None):
+         use_moderator=False, moderator_price=None, engine="loop", volatility="market",
+         history=None, collusion_monitor=None):
     """
     Simulates a competitive electricity market using Nash equilibrium and Adam optimizer.
 
@@ -89,12 +178,20 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
     - initial_prices (list, optional): Initial prices of sellers (if provided).
     - use_moderator (bool, optional): Whether a moderator seller is included.
     - moderator_price (float, optional): Predefined price for the moderator.
+    - engine (str, optional): "loop" updates sellers one at a time, "vectorized" updates
+      all sellers at once with NumPy array operations (recommended for large markets).
+    - volatility (str, optional): "market" shares one adaptive learning rate per iteration across
+      all sellers, "seller" tracks each seller's own price volatility (heterogeneous markets).
+    - history (MarketHistory, optional): Store for price/share history, e.g. memory-mapped or
+      summary-only; a preallocated in-memory store of max_iterations + 1 rows is used by default.
+    - collusion_monitor (CollusionMonitor, optional): Online collusion detector updated every
+      iteration; the game stops early once it flags the market.
 
     Returns:
     - final_prices (list): Final equilibrium prices of sellers.
     - buyer_shares (list): Allocated electricity shares for each seller.
-    - price_history (list): Evolution of prices over iterations.
-    - share_history (list): Evolution of market shares over iterations.
+    - price_history (ndarray): Evolution of prices over iterations (one row per iteration).
+    - share_history (ndarray): Evolution of market shares over iterations.
     - iterations (int): Number of iterations taken for convergence.
     """
 
@@ -110,19 +207,28 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
     if use_moderator and moderator_price is not None:
         prices[-1] = max(production_costs[-1], min(moderator_price, production_costs[-1] * (1 + max_profit_percentage)))
 
+    if volatility not in ("market", "seller"):
+        raise ValueError(f"Unknown volatility mode: {volatility!r} (expected 'market' or 'seller')")
+    if history is None:
+        history = MarketHistory(num_sellers, max_iterations + 1)
+    if engine == "vectorized":
+        return _saki_vectorized(prices, capacities, qualities, production_costs, buyer_demand,
+                                max_profit_percentage, min_profits, max_change_percentage,
+                                tolerance, max_iterations, volatility, history, collusion_monitor)
+    if engine != "loop":
+        raise ValueError(f"Unknown saki engine: {engine!r} (expected 'loop' or 'vectorized')")
+
     buyer_shares = np.zeros(num_sellers)  # Initialize buyer's allocated shares
-    price_history = []  # Store price evolution for later analysis
-    share_history = []  # Store market share evolution for later analysis
 
     # 🟢 Step 2: Initialize Adam optimizer for dynamic price adjustments
-    adam_optimizers = [AdamOptimizer(lr=0.05) for _ in range(num_sellers)]
+    adam_optimizers = AdamOptimizerBank(num_sellers, lr=0.05)
+    volatility_tracker = PriceVolatilityTracker(num_sellers, per_seller=(volatility == "seller"))
 
     iteration = 0  # Track the number of iterations
     reset_threshold = max(10, max_iterations // 20)  # Threshold for market stagnation detection
     no_significant_change_count = 0  # Count consecutive iterations with negligible price changes
 
-    price_history.append(prices.copy())  # Store initial prices
-    share_history.append(buyer_shares.copy())  # Store initial shares
+    history.append(prices, buyer_shares)  # Store initial prices and shares
 
     # 🟢 Step 3: Iterative market price adjustment
     while iteration < max_iterations:
@@ -140,6 +246,17 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
         buyer_shares = weighted_utility * buyer_demand  # Compute buyer allocation
         buyer_shares = np.minimum(buyer_shares, capacities)  # Ensure shares don't exceed capacities
 
+        # ✅ Learning rates for this iteration: Adam warm-up, then volatility-based rates
+        if iteration <= 10:
+            learning_rates = adam_optimizers.update(
+                buyer_shares - (np.array(prices) - np.array(production_costs)), buyer_shares > 0)
+        else:
+            learning_rates = np.broadcast_to(volatility_tracker.learning_rate(iteration), (num_sellers,))
+
+        # ✅ Minimum profit price floor for every seller at the current shares
+        profit_floors = minimum_profit_price(
+            production_costs, min_profits, buyer_shares, np.array(production_costs) * (1 + max_profit_percentage))
+
         # 🟢 Step 4: Update seller prices using gradient descent
         for i in range(num_sellers):
             if buyer_shares[i] > 0:  # Only adjust prices for active sellers
@@ -147,10 +264,7 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
                 profit_gradient = buyer_shares[i] - (prices[i] - production_costs[i])
 
                 # ✅ Adjust learning rate dynamically
-                if iteration <= 10:
-                    learning_rate = adam_optimizers[i].update(profit_gradient)
-                else:
-                    learning_rate = adaptive_learning_rate(iteration, prev_prices, prices)
+                learning_rate = learning_rates[i]
 
                 # ✅ Compute new price using gradient descent
                 new_price = prices[i] + learning_rate * profit_gradient
@@ -162,22 +276,16 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
                 # ✅ Ensure price remains within valid profit range
                 new_price = min(max(new_price, production_costs[i]), production_costs[i] * (1 + max_profit_percentage))
 
-                # ✅ Ensure minimum profit constraint is met
-                profit = (new_price - production_costs[i]) * buyer_shares[i]
-                if profit < min_profits[i]:
-                    step = 0.5
-                    while profit < min_profits[i]:
-                        new_price += step
-                        if new_price > production_costs[i] * (1 + max_profit_percentage):
-                            break
-                        profit = (new_price - production_costs[i]) * buyer_shares[i]
-                    prices[i] = min(new_price, production_costs[i] * (1 + max_profit_percentage))
-                else:
-                    prices[i] = new_price
+                # ✅ Ensure minimum profit constraint is met (floor is already capped at the max profit price)
+                prices[i] = float(max(new_price, profit_floors[i]))
 
         # ✅ Store price and market share history
-        price_history.append(prices.copy())
-        share_history.append(buyer_shares.copy())
+        history.append(prices, buyer_shares)
+        volatility_tracker.update(prev_prices, prices)
+
+        # 🚨 Stop early if the online detector flags collusion
+        if collusion_monitor is not None and collusion_monitor.update(prev_prices, prices, buyer_shares, iteration):
+            break
 
         # ✅ Step 5: Check for market convergence
         price_difference = np.abs(np.array(prices) - np.array(prev_prices))
@@ -189,7 +297,7 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
         # 🚨 Detect market stagnation and reset learning rates
         if no_significant_change_count >= reset_threshold:
             print("\n⚠ Market seems stagnant! Resetting learning rates for better convergence.")
-            adam_optimizers = [AdamOptimizer(lr=0.05) for _ in range(num_sellers)]  # Reset optimizers
+            adam_optimizers.reset()  # Reset optimizers
             no_significant_change_count = 0  # Reset stagnation counter
 
         # ✅ If all prices remain stable, stop iterations
@@ -201,4 +309,95 @@ def saki(num_sellers, capacities, qualities, production_costs, buyer_demand, max
     for i in range(num_sellers):
         print(f"Seller {i + 1}: {weighted_utility[i]:.7f}")
 
-    return prices, buyer_shares, price_history, share_history, iteration
\ No newline at end of file
+    history.flush()
+    return prices, buyer_shares, history.prices(), history.shares(), iteration
+
+
+# Vectorized market engine: each step operates on the whole seller array at once
+def _saki_vectorized(prices, capacities, qualities, production_costs, buyer_demand, max_profit_percentage,
+                     min_profits, max_change_percentage, tolerance, max_iterations, volatility="market",
+                     history=None, collusion_monitor=None):
+    """
+    Array-based counterpart of the saki() seller loop (same inputs, same return values).
+    """
+
+    global weighted_utility
+
+    prices = np.array(prices, dtype=float)
+    capacities = np.asarray(capacities, dtype=float)
+    qualities = np.asarray(qualities, dtype=float)
+    production_costs = np.asarray(production_costs, dtype=float)
+    min_profits = np.asarray(min_profits, dtype=float)
+    num_sellers = len(prices)
+
+    price_cap = production_costs * (1 + max_profit_percentage)  # Highest price allowed per seller
+
+    adam_optimizers = AdamOptimizerBank(num_sellers, lr=0.05)
+    volatility_tracker = PriceVolatilityTracker(num_sellers, per_seller=(volatility == "seller"))
+
+    buyer_shares = np.zeros(num_sellers)
+    if history is None:
+        history = MarketHistory(num_sellers, max_iterations + 1)
+    history.append(prices, buyer_shares)
+
+    iteration = 0
+    reset_threshold = max(10, max_iterations // 20)
+    no_significant_change_count = 0
+
+    while iteration < max_iterations:
+        iteration += 1
+        prev_prices = prices.copy()
+
+        # ✅ Utility scores and buyer allocation (identical to the loop engine)
+        utility_scores = (qualities / prices) * capacities
+        if np.sum(utility_scores) == 0:
+            utility_scores = np.ones(num_sellers) / num_sellers
+        weighted_utility = utility_scores / np.sum(utility_scores)
+        buyer_shares = np.minimum(weighted_utility * buyer_demand, capacities)
+
+        active = buyer_shares > 0  # Only sellers with a share adjust their price
+        profit_gradient = buyer_shares - (prices - production_costs)
+
+        # ✅ Learning rate: per-seller Adam for warm-up, then one volatility-based rate per iteration
+        if iteration <= 10:
+            learning_rate = adam_optimizers.update(profit_gradient, active)
+        else:
+            learning_rate = volatility_tracker.learning_rate(iteration)
+
+        # ✅ Gradient step, max change restriction and valid profit range
+        new_prices = prices + learning_rate * profit_gradient
+        max_change = prices * max_change_percentage
+        new_prices = np.maximum(np.minimum(new_prices, prices + max_change), prices - max_change)
+        new_prices = np.minimum(np.maximum(new_prices, production_costs), price_cap)
+
+        # ✅ Minimum profit constraint: exact price floor, capped at the max profit price
+        new_prices = np.maximum(new_prices, minimum_profit_price(production_costs, min_profits, buyer_shares, price_cap))
+
+        prices = np.where(active, new_prices, prices)
+
+        history.append(prices, buyer_shares)
+        volatility_tracker.update(prev_prices, prices)
+
+        if collusion_monitor is not None and collusion_monitor.update(prev_prices, prices, buyer_shares, iteration):
+            break
+
+        # ✅ Convergence and stagnation checks
+        if np.all(np.abs(prices - prev_prices) < tolerance):
+            no_significant_change_count += 1
+        else:
+            no_significant_change_count = 0
+
+        if no_significant_change_count >= reset_threshold:
+            print("\n⚠ Market seems stagnant! Resetting learning rates for better convergence.")
+            adam_optimizers.reset()
+            no_significant_change_count = 0
+
+        if np.allclose(prev_prices, prices, atol=tolerance):
+            break
+
+    print("\n📊 Weighted Utility Scores of Sellers:")
+    for i in range(num_sellers):
+        print(f"Seller {i + 1}: {weighted_utility[i]:.7f}")
+
+    history.flush()
+    return prices.tolist(), buyer_shares, history.prices(), history.shares(), iteration
@@ -0,0 +1,160 @@
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .collusion import detect_collusion
+from .saki_core import saki
+
+
+# 🔹 Scenario generators
+def parameter_grid(**axes):
+    """Returns one scenario dict per combination of the given parameter values (cartesian product)."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def monte_carlo_points(sampler, num_samples, seed=None):
+    """Draws num_samples scenario dicts from sampler(rng), a callable using a NumPy Generator."""
+    rng = np.random.default_rng(seed)
+    return [sampler(rng) for _ in range(num_samples)]
+
+
+def _canonical_json(value):
+    return json.dumps(value, sort_keys=True, default=lambda item: np.asarray(item).tolist())
+
+
+def sweep_fingerprint(base_market, engine):
+    """Hash of the sweep settings shared by every scenario (base market and engine)."""
+    return hashlib.sha256(_canonical_json({"base_market": base_market, "engine": engine}).encode()).hexdigest()
+
+
+def sweep_point_id(point, fingerprint=""):
+    """
+    Stable identifier of a scenario, used to skip finished points when a sweep is resumed.
+
+    The fingerprint (see sweep_fingerprint) ties the identifier to the base market and engine,
+    so a checkpoint of a different sweep is never mistaken for finished results.
+    """
+    canonical = fingerprint + _canonical_json(point)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+# 🔹 Single scenario run (executed inside worker processes)
+def build_scenario_market(base_market, point):
+    """
+    Applies a scenario to a base market.
+
+    Keys of the point override the matching saki() arguments. The special key "cost_scale"
+    multiplies every production cost. Initial prices are clipped into the new valid price range.
+    """
+    market = dict(base_market)
+    market.update({key: value for key, value in point.items() if key != "cost_scale"})
+    production_costs = np.asarray(market["production_costs"], dtype=float) * point.get("cost_scale", 1.0)
+    price_cap = production_costs * (1 + market["max_profit_percentage"])
+    market["production_costs"] = production_costs.tolist()
+    market["initial_prices"] = np.clip(market["initial_prices"], production_costs, price_cap).tolist()
+    return market
+
+
+def _run_sweep_point(task):
+    point_id, point, base_market, engine = task
+    market = build_scenario_market(base_market, point)
+    market.setdefault("engine", engine)  # An "engine" key in the base market or point wins
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        final_prices, buyer_shares, price_history, _, iterations = saki(**market)
+        collusion_detected = detect_collusion(
+            market["num_sellers"], final_prices, buyer_shares, price_history, iterations)
+    return {
+        "point_id": point_id,
+        **point,
+        "final_prices": [float(p) for p in final_prices],
+        "buyer_shares": [float(s) for s in buyer_shares],
+        "iterations": int(iterations),
+        "collusion_detected": bool(collusion_detected),
+    }
+
+
+# 🔹 Parallel, resumable sweep
+def load_checkpoint(checkpoint_path):
+    """
+    Reads the finished scenarios of a checkpoint file as {point_id: row}.
+
+    A last line cut off by a crash mid-write is dropped (with a warning) and truncated away, so
+    the rows appended on resume start on a fresh line; other undecodable lines are skipped.
+    """
+    finished = {}
+    with open(checkpoint_path, "rb+") as file:
+        offset = 0
+        for line in file:
+            end = offset + len(line)
+            try:
+                row = json.loads(line) if line.strip() else None
+            except ValueError:
+                row = None
+                if end == os.fstat(file.fileno()).st_size:
+                    print(f"⚠ Dropping incomplete last line of checkpoint {checkpoint_path}.")
+                    file.truncate(offset)
+                    break
+                print(f"⚠ Skipping unreadable line at byte {offset} of checkpoint {checkpoint_path}.")
+            if row is not None:
+                finished[row["point_id"]] = row
+            offset = end
+        else:
+            if offset and not line.endswith(b"\n"):
+                file.write(b"\n")  # Complete last row written without its newline
+    return finished
+
+
+def run_sweep(base_market, points, checkpoint_path=None, processes=None, chunksize=8, engine="vectorized"):
+    """
+    Runs saki() for every scenario across a process pool and collects the results in one table.
+
+    Parameters:
+    - base_market (dict): saki() keyword arguments, including initial_prices.
+    - points (list of dict): Scenarios from parameter_grid / monte_carlo_points.
+    - checkpoint_path (str, optional): JSON Lines file; each finished scenario is appended to it,
+      and scenarios already present are skipped when the sweep is run again.
+    - processes (int, optional): Worker processes (default: CPU count; 1 runs in-process).
+    - chunksize (int): Scenarios handed to a worker at a time.
+    - engine (str): saki() engine used for every run (unless base_market or a point sets "engine").
+
+    Returns:
+    - results (DataFrame): One row per scenario with its parameters, final_prices, buyer_shares,
+      iterations and collusion_detected.
+
+    On Windows, call run_sweep from under an `if __name__ == "__main__":` guard.
+    """
+    finished = {}
+    if checkpoint_path is not None and os.path.exists(checkpoint_path):
+        finished = load_checkpoint(checkpoint_path)
+        print(f"🔄 Resuming sweep: {len(finished)} scenario(s) already finished.")
+
+    fingerprint = sweep_fingerprint(base_market, engine)
+    point_ids = [sweep_point_id(point, fingerprint) for point in points]
+    tasks = [(point_id, point, base_market, engine)
+             for point_id, point in zip(point_ids, points) if point_id not in finished]
+
+    with contextlib.ExitStack() as stack:
+        checkpoint = None
+        if checkpoint_path is not None:
+            checkpoint = stack.enter_context(open(checkpoint_path, "a", encoding="utf-8"))
+        if processes == 1:
+            rows = map(_run_sweep_point, tasks)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=processes))
+            rows = executor.map(_run_sweep_point, tasks, chunksize=chunksize)
+        for row in rows:
+            finished[row["point_id"]] = row
+            if checkpoint is not None:
+                checkpoint.write(json.dumps(row) + "\n")
+                checkpoint.flush()
+
+    print(f"✅ Sweep completed: {len(tasks)} scenario(s) run, {len(points)} in total.")
+    import pandas as pd  # Deferred: only needed for the result table
+
+    return pd.DataFrame([finished[point_id] for point_id in point_ids])
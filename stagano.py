@@ -1,20 +1,58 @@
 import wave
 import base64
 
+import numpy as np
+
+END_MARKER = "EOF"
+CHUNK_FRAMES = 4096  # Frames read per chunk; the payload usually ends within the first one
+
+def _read_lsb_text(audio, chunk_frames=CHUNK_FRAMES):
+    """
+    Decodes the text hidden in the least significant bits of the audio data bytes: one bit per
+    byte, most significant bit first, over the first eighth of the bytes. Frames are read
+    chunk by chunk and decoding stops at the end marker, so memory follows the payload size.
+    """
+    limit = audio.getnframes() * audio.getsampwidth() * audio.getnchannels() // 8
+    text, pending, scanned, read, found = "", np.empty(0, dtype=np.uint8), 0, 0, False
+    while scanned < limit and not found:
+        chunk = audio.readframes(chunk_frames)
+        if not chunk:
+            break
+        read += len(chunk)
+        data = np.frombuffer(chunk, dtype=np.uint8)[:limit - scanned]
+        scanned += len(data)
+        bits = np.concatenate((pending, data & 1))
+        whole = len(bits) - len(bits) % 8
+        search_from = max(len(text) - len(END_MARKER) + 1, 0)
+        text += np.packbits(bits[:whole]).tobytes().decode("latin-1")
+        pending = bits[whole:]
+        found = text.find(END_MARKER, search_from) != -1
+
+    # Only the first eighth of the bytes actually in the file is decoded: make sure a file
+    # shorter than its header claims still covers the decoded bytes (read ahead, data dropped)
+    needed = 64 * (text.find(END_MARKER) + len(END_MARKER)) if found else 8 * scanned
+    while read < needed:
+        chunk = audio.readframes(chunk_frames)
+        if not chunk:
+            break
+        read += len(chunk)
+
+    # Cut to the decoded byte count; a trailing partial byte becomes int(bits, 2) of its bits
+    full, extra = divmod(min(scanned, read // 8), 8)
+    tail = np.concatenate((np.unpackbits(np.frombuffer(text[full:full + 1].encode("latin-1"), dtype=np.uint8)),
+                           pending))[:extra]
+    text = text[:full]
+    if extra:
+        text += chr(int("".join(str(bit) for bit in tail), 2))
+    return text
+
 def extract_hidden_hash(audio_path):
     """Extracts the license hash hidden in the audio file."""
     with wave.open(audio_path, 'rb') as audio:
-        frames = bytearray(audio.readframes(audio.getnframes()))
-
-    # Extract bits from LSB
-    binary_data = ''.join(str(sample & 1) for sample in frames[:len(frames) // 8])
-
-    # Convert binary to string
-    byte_chunks = [binary_data[i:i+8] for i in range(0, len(binary_data), 8)]
-    extracted_text = ''.join(chr(int(byte, 2)) for byte in byte_chunks)
+        extracted_text = _read_lsb_text(audio)
 
     # Find EOF marker
-    end_marker = extracted_text.find("EOF")
+    end_marker = extracted_text.find(END_MARKER)
     if end_marker != -1:
         extracted_text = extracted_text[:end_marker]
 